@@ -21,6 +21,8 @@ def init_function(host_component: Any, config: Optional[Dict[str, Any]] = None)
             - host: Host to bind to (default: 127.0.0.1)
             - host_directory: Directory to serve files from (default: ./hosted_files)
             - base_url: Custom base URL for proxies/firewalls (optional)
+            - cache_max_age: Seconds browsers may cache hosted files without
+              revalidating (default: 0, always revalidate)
     """
     logger.info("[ArtifactHost:init] Starting artifact hosting web server")
 
@@ -29,6 +31,7 @@ def init_function(host_component: Any, config: Optional[Dict[str, Any]] = None)
     port = current_config.get("port", 8080)
     host = current_config.get("host", "127.0.0.1")
     host_directory = current_config.get("host_directory", "./hosted_files")
+    cache_max_age = int(current_config.get("cache_max_age", 0))
 
     # Convert host_directory to Path
     host_dir_path = Path(host_directory)
@@ -43,7 +46,8 @@ def init_function(host_component: Any, config: Optional[Dict[str, Any]] = None)
         web_server = ArtifactWebServer(
             host_directory=host_dir_path,
             port=port,
-            host=host
+            host=host,
+            cache_max_age=cache_max_age
         )
 
         web_server.start()
@@ -1,44 +1,94 @@
 import logging
 import asyncio
+import functools
+import hashlib
 import inspect
 import re
 import shutil
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from google.adk.tools import ToolContext
 from solace_agent_mesh.agent.utils.context_helpers import get_original_session_id
 
-from .web_server import get_web_server
+from .web_server import get_web_server, is_safe_filename
 
 logger = logging.getLogger(__name__)
 
+# Patterns for SAM artifact references: «artifact_content:filename >>> format:datauri»
+# They match UTF-8 bytes directly, so HTML is never decoded and re-encoded as a whole.
+# '«', '›' and '»' are multi-byte in UTF-8, so "[^›»]" becomes a negative lookahead.
+_ARTIFACT_REF_EXTRACT = re.compile(
+    r'«artifact_content:((?:(?!›|»).)+)\s*>>>'.encode('utf-8'), re.DOTALL
+)
+_ARTIFACT_REF_REPLACE = re.compile(
+    r'«artifact_content:((?:(?!›|»).)+)\s*>>>.*?»'.encode('utf-8'), re.DOTALL
+)
+# UTF-8 encoded prefix of every reference, checked on raw bytes before decoding
+_ARTIFACT_REF_SENTINEL = '«artifact_content:'.encode('utf-8')
 
-def _extract_artifact_references(html_content: str) -> List[str]:
+# Payloads up to this size are written inline on the event loop; a buffered
+# write this small is cheaper than the thread-pool hop.
+_INLINE_WRITE_MAX_BYTES = 64 * 1024
+
+# Large payloads are written to disk in slices of this size
+_WRITE_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+@dataclass(frozen=True)
+class _ServiceBinding:
+    """Awaitable `list_versions`/`load_artifact` for one artifact service type, called as fn(service, **kwargs)."""
+    list_versions: Callable[..., Awaitable[Any]]
+    load_artifact: Callable[..., Awaitable[Any]]
+
+
+def _bind_async(method: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """Return an unbound service method as-is if it is a coroutine function, else wrap it to run in a thread."""
+    if inspect.iscoroutinefunction(method):
+        return method
+
+    async def call_in_thread(service: Any, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(method, service, **kwargs)
+
+    return call_in_thread
+
+
+@functools.lru_cache(maxsize=32)
+def _get_service_binding(service_type: type) -> _ServiceBinding:
+    """Inspect an artifact service type once and cache its async call wrappers."""
+    return _ServiceBinding(
+        list_versions=_bind_async(getattr(service_type, "list_versions")),
+        load_artifact=_bind_async(getattr(service_type, "load_artifact")),
+    )
+
+
+def _extract_artifact_references(html_content: bytes) -> List[str]:
     """
     Extract artifact filenames from SAM artifact references in HTML.
 
     Looks for patterns like: «artifact_content:filename >>> format:datauri»
 
     Args:
-        html_content: HTML content as string
+        html_content: UTF-8 encoded HTML content
 
     Returns:
         List of artifact filenames referenced in the HTML
+
+    Raises:
+        UnicodeDecodeError: If a referenced filename is not valid UTF-8
     """
-    # Pattern to match «artifact_content:filename >>> format:datauri»
-    pattern = r'«artifact_content:([^›»]+)\s*>>>'
-    matches = re.findall(pattern, html_content)
+    matches = _ARTIFACT_REF_EXTRACT.findall(html_content)
 
     # Remove any whitespace and return unique filenames
-    filenames = [match.strip() for match in matches]
+    filenames = [match.decode('utf-8').strip() for match in matches]
     unique_filenames = list(dict.fromkeys(filenames))  # Preserve order while removing duplicates
 
     logger.debug(f"[ArtifactHost] Extracted {len(unique_filenames)} artifact references: {unique_filenames}")
     return unique_filenames
 
 
-def _replace_artifact_references(html_content: str, filename_map: Dict[str, str]) -> str:
+def _replace_artifact_references(html_content: bytes, filename_map: Dict[str, str]) -> bytes:
     """
     Replace SAM artifact references with normal relative URLs.
 
@@ -46,23 +96,121 @@ def _replace_artifact_references(html_content: str, filename_map: Dict[str, str]
     With: filename (or custom mapped name)
 
     Args:
-        html_content: Original HTML content
+        html_content: Original UTF-8 encoded HTML content
         filename_map: Mapping of original filename to hosted filename
 
     Returns:
-        Updated HTML content with artifact references replaced
+        Updated UTF-8 encoded HTML content with artifact references replaced
     """
-    def replace_reference(match):
-        original_filename = match.group(1).strip()
+    # Replace all artifact references, joining the untouched segments in between
+    pieces = []
+    pos = 0
+    for match in _ARTIFACT_REF_REPLACE.finditer(html_content):
+        original_filename = match.group(1).decode('utf-8').strip()
+        pieces.append(html_content[pos:match.start()])
         # Use mapped filename if available, otherwise use original
-        hosted_filename = filename_map.get(original_filename, original_filename)
-        return hosted_filename
+        pieces.append(filename_map.get(original_filename, original_filename).encode('utf-8'))
+        pos = match.end()
+    pieces.append(html_content[pos:])
+
+    return b''.join(pieces)
+
+
+async def _resolve_artifact_version(
+    artifact_filename: str,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    artifact_service: Any,
+) -> Tuple[str, int]:
+    """
+    Split an artifact filename into its base name and version, looking up the latest version if none is given.
+
+    Args:
+        artifact_filename: Artifact filename with optional version (e.g., "photo.jpg:2")
+        app_name: Application name for the artifact service
+        user_id: User ID for the artifact service
+        session_id: Session ID for the artifact service
+        artifact_service: Artifact service to query
+
+    Returns:
+        Tuple of (filename_base, version)
+
+    Raises:
+        FileNotFoundError: If the artifact has no versions
+    """
+    # Parse artifact filename and version
+    parts = artifact_filename.rsplit(":", 1)
+    filename_base = parts[0]
+    version_str = parts[1] if len(parts) > 1 else None
+    version_to_load = int(version_str) if version_str else None
+
+    # Get latest version if not specified
+    if version_to_load is None:
+        binding = _get_service_binding(type(artifact_service))
+        versions = await binding.list_versions(
+            artifact_service, app_name=app_name, user_id=user_id,
+            session_id=session_id, filename=filename_base
+        )
+        if not versions:
+            raise FileNotFoundError(f"Artifact '{filename_base}' not found.")
+        version_to_load = max(versions)
+
+    return filename_base, version_to_load
+
+
+async def _load_artifact_content(
+    filename_base: str,
+    version: int,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    artifact_service: Any,
+    log_identifier: str,
+) -> bytes:
+    """
+    Load the content of a specific artifact version.
+
+    Raises:
+        FileNotFoundError: If the artifact version has no content
+    """
+    logger.debug(f"{log_identifier} Loading artifact version {version}")
+
+    # Load artifact
+    binding = _get_service_binding(type(artifact_service))
+    artifact = await binding.load_artifact(
+        artifact_service, app_name=app_name, user_id=user_id,
+        session_id=session_id, filename=filename_base, version=version
+    )
+
+    if not artifact or not artifact.inline_data:
+        raise FileNotFoundError(f"Content for '{filename_base}' v{version} not found.")
 
-    # Replace all artifact references
-    pattern = r'«artifact_content:([^›»]+)\s*>>>[^»]*»'
-    updated_html = re.sub(pattern, replace_reference, html_content)
+    artifact_bytes = artifact.inline_data.data
+    logger.debug(f"{log_identifier} Loaded artifact: {len(artifact_bytes)} bytes")
 
-    return updated_html
+    return artifact_bytes
+
+
+def _get_hosted_filename(filename_base: str, custom_filename: Optional[str]) -> str:
+    """
+    Determine the filename an artifact is hosted under.
+
+    Args:
+        filename_base: Artifact filename without version
+        custom_filename: Optional custom name for the hosted file
+
+    Returns:
+        The custom name (keeping the original extension if it has none), or the original name
+    """
+    if not custom_filename:
+        return filename_base
+
+    # Preserve original extension if custom name doesn't have one
+    if '.' not in custom_filename and '.' in filename_base:
+        return f"{custom_filename}{Path(filename_base).suffix}"
+
+    return custom_filename
 
 
 async def _host_single_artifact(
@@ -73,72 +221,46 @@ async def _host_single_artifact(
     session_id: str,
     artifact_service: Any,
     web_server: Any,
-    base_url: Optional[str] = None
+    base_url: Optional[str] = None,
+    pending_writes: Optional[List[Tuple[str, bytes, Optional[Tuple]]]] = None
 ) -> Dict[str, Any]:
     """
     Helper function to host a single artifact.
 
+    If `pending_writes` is given, the file is not written here; instead
+    (hosted_filename, content, source) is appended for the caller to write
+    with `_write_hosted_files`, together with any other files.
+
     Returns dict with 'status', 'hosted_filename', 'url', etc.
     """
     log_identifier = f"[ArtifactHost:_host_single:{artifact_filename}]"
 
     try:
-        # Parse artifact filename and version
-        parts = artifact_filename.rsplit(":", 1)
-        filename_base = parts[0]
-        version_str = parts[1] if len(parts) > 1 else None
-        version_to_load = int(version_str) if version_str else None
-
-        # Get latest version if not specified
-        if version_to_load is None:
-            list_versions_method = getattr(artifact_service, "list_versions")
-            if inspect.iscoroutinefunction(list_versions_method):
-                versions = await list_versions_method(
-                    app_name=app_name, user_id=user_id, session_id=session_id, filename=filename_base
-                )
-            else:
-                versions = await asyncio.to_thread(
-                    list_versions_method, app_name=app_name, user_id=user_id,
-                    session_id=session_id, filename=filename_base
-                )
-            if not versions:
-                raise FileNotFoundError(f"Artifact '{filename_base}' not found.")
-            version_to_load = max(versions)
-
-        logger.debug(f"{log_identifier} Loading artifact version {version_to_load}")
-
-        # Load artifact
-        load_artifact_method = getattr(artifact_service, "load_artifact")
-        if inspect.iscoroutinefunction(load_artifact_method):
-            artifact = await load_artifact_method(
-                app_name=app_name, user_id=user_id, session_id=session_id,
-                filename=filename_base, version=version_to_load
-            )
-        else:
-            artifact = await asyncio.to_thread(
-                load_artifact_method, app_name=app_name, user_id=user_id,
-                session_id=session_id, filename=filename_base, version=version_to_load
-            )
-
-        if not artifact or not artifact.inline_data:
-            raise FileNotFoundError(f"Content for '{filename_base}' v{version_to_load} not found.")
-
-        artifact_bytes = artifact.inline_data.data
-        logger.debug(f"{log_identifier} Loaded artifact: {len(artifact_bytes)} bytes")
-
-        # Determine hosted filename
-        hosted_filename = custom_filename if custom_filename else filename_base
-
-        # Ensure filename has extension
-        if custom_filename and '.' not in custom_filename and '.' in filename_base:
-            extension = Path(filename_base).suffix
-            hosted_filename = f"{custom_filename}{extension}"
+        filename_base, version_to_load = await _resolve_artifact_version(
+            artifact_filename, app_name, user_id, session_id, artifact_service
+        )
 
-        # Write artifact to web server directory
+        hosted_filename = _get_hosted_filename(filename_base, custom_filename)
+        if not is_safe_filename(hosted_filename):
+            raise ValueError(f"Invalid hosted filename: {hosted_filename}")
         hosted_path = web_server.host_directory / hosted_filename
-        await asyncio.to_thread(_write_file, hosted_path, artifact_bytes)
+        source = (app_name, user_id, session_id, filename_base, version_to_load)
 
-        logger.info(f"{log_identifier} Artifact written to {hosted_path}")
+        # Skip the load and write if this exact artifact version is already hosted under this name
+        if web_server.is_hosted(hosted_filename, source) and hosted_path.is_file():
+            logger.debug(f"{log_identifier} Already hosted as {hosted_filename}, skipping load")
+        else:
+            artifact_bytes = await _load_artifact_content(
+                filename_base, version_to_load, app_name, user_id, session_id,
+                artifact_service, log_identifier
+            )
+
+            # Write artifact to web server directory
+            if pending_writes is not None:
+                pending_writes.append((hosted_filename, artifact_bytes, source))
+            else:
+                await _write_hosted_files(web_server, [(hosted_filename, artifact_bytes, source)])
+                logger.info(f"{log_identifier} Artifact written to {hosted_path}")
 
         # Generate URL
         url = web_server.get_url(hosted_filename, base_url)
@@ -212,57 +334,19 @@ async def host_artifact(
         if not all([app_name, user_id, session_id, artifact_service]):
             raise ValueError("Missing required context parts")
 
-        # Parse artifact filename and version
-        parts = artifact_filename.rsplit(":", 1)
-        filename_base = parts[0]
-        version_str = parts[1] if len(parts) > 1 else None
-        version_to_load = int(version_str) if version_str else None
-
-        # Get latest version if not specified
-        if version_to_load is None:
-            list_versions_method = getattr(artifact_service, "list_versions")
-            if inspect.iscoroutinefunction(list_versions_method):
-                versions = await list_versions_method(
-                    app_name=app_name, user_id=user_id, session_id=session_id, filename=filename_base
-                )
-            else:
-                versions = await asyncio.to_thread(
-                    list_versions_method, app_name=app_name, user_id=user_id,
-                    session_id=session_id, filename=filename_base
-                )
-            if not versions:
-                raise FileNotFoundError(f"Artifact '{filename_base}' not found.")
-            version_to_load = max(versions)
-
-        logger.debug(f"{log_identifier} Loading artifact version {version_to_load}")
-
-        # Load artifact
-        load_artifact_method = getattr(artifact_service, "load_artifact")
-        if inspect.iscoroutinefunction(load_artifact_method):
-            artifact = await load_artifact_method(
-                app_name=app_name, user_id=user_id, session_id=session_id,
-                filename=filename_base, version=version_to_load
-            )
-        else:
-            artifact = await asyncio.to_thread(
-                load_artifact_method, app_name=app_name, user_id=user_id,
-                session_id=session_id, filename=filename_base, version=version_to_load
-            )
-
-        if not artifact or not artifact.inline_data:
-            raise FileNotFoundError(f"Content for '{filename_base}' v{version_to_load} not found.")
+        filename_base, version_to_load = await _resolve_artifact_version(
+            artifact_filename, app_name, user_id, session_id, artifact_service
+        )
 
-        artifact_bytes = artifact.inline_data.data
-        logger.debug(f"{log_identifier} Loaded artifact: {len(artifact_bytes)} bytes")
+        hosted_filename = _get_hosted_filename(filename_base, custom_filename)
+        if not is_safe_filename(hosted_filename):
+            logger.warning(f"{log_identifier} Refusing unsafe hosted filename: {hosted_filename!r}")
+            return {"status": "error", "message": f"Invalid hosted filename: {hosted_filename}"}
 
-        # Determine hosted filename
-        hosted_filename = custom_filename if custom_filename else filename_base
-
-        # Ensure filename has extension
-        if custom_filename and '.' not in custom_filename and '.' in filename_base:
-            # Preserve original extension if custom name doesn't have one
-            extension = Path(filename_base).suffix
-            hosted_filename = f"{custom_filename}{extension}"
+        artifact_bytes = await _load_artifact_content(
+            filename_base, version_to_load, app_name, user_id, session_id,
+            artifact_service, log_identifier
+        )
 
         # Get configuration
         current_tool_config = tool_config if tool_config is not None else {}
@@ -270,35 +354,45 @@ async def host_artifact(
 
         # Check if this is an HTML file - if so, process artifact references
         referenced_artifacts = []
+        html_rewritten = False
+        # Referenced artifacts are written together with the primary file below
+        pending_writes: List[Tuple[str, bytes, Optional[Tuple]]] = []
         is_html = hosted_filename.lower().endswith(('.html', '.htm'))
 
-        if is_html:
+        if is_html and _ARTIFACT_REF_SENTINEL not in artifact_bytes:
+            logger.debug(f"{log_identifier} No artifact references in HTML, skipping reference processing")
+        elif is_html:
             try:
-                # Decode HTML content
-                html_content = artifact_bytes.decode('utf-8')
-
                 # Extract artifact references
-                referenced_filenames = _extract_artifact_references(html_content)
+                referenced_filenames = _extract_artifact_references(artifact_bytes)
 
                 if referenced_filenames:
                     logger.info(f"{log_identifier} Found {len(referenced_filenames)} artifact references in HTML: {referenced_filenames}")
 
-                    # Host each referenced artifact
+                    # Host all referenced artifacts concurrently
+                    results = await asyncio.gather(
+                        *[
+                            _host_single_artifact(
+                                artifact_filename=ref_filename,
+                                custom_filename=None,
+                                app_name=app_name,
+                                user_id=user_id,
+                                session_id=session_id,
+                                artifact_service=artifact_service,
+                                web_server=web_server,
+                                base_url=base_url,
+                                pending_writes=pending_writes
+                            )
+                            for ref_filename in referenced_filenames
+                        ],
+                        return_exceptions=True
+                    )
+
                     filename_map = {}
-                    for ref_filename in referenced_filenames:
-                        logger.info(f"{log_identifier} Hosting referenced artifact: {ref_filename}")
-                        result = await _host_single_artifact(
-                            artifact_filename=ref_filename,
-                            custom_filename=None,
-                            app_name=app_name,
-                            user_id=user_id,
-                            session_id=session_id,
-                            artifact_service=artifact_service,
-                            web_server=web_server,
-                            base_url=base_url
-                        )
-
-                        if result["status"] == "success":
+                    for ref_filename, result in zip(referenced_filenames, results):
+                        if isinstance(result, BaseException):
+                            logger.warning(f"{log_identifier} Failed to host {ref_filename}: {result}")
+                        elif result["status"] == "success":
                             filename_map[ref_filename] = result["hosted_filename"]
                             referenced_artifacts.append({
                                 "filename": ref_filename,
@@ -311,20 +405,25 @@ async def host_artifact(
 
                     # Replace artifact references in HTML with regular filenames
                     if filename_map:
-                        updated_html = _replace_artifact_references(html_content, filename_map)
-                        artifact_bytes = updated_html.encode('utf-8')
+                        artifact_bytes = _replace_artifact_references(artifact_bytes, filename_map)
+                        html_rewritten = True
                         logger.info(f"{log_identifier} Replaced {len(filename_map)} artifact references in HTML")
 
             except UnicodeDecodeError:
-                logger.warning(f"{log_identifier} Could not decode HTML content as UTF-8, skipping artifact reference processing")
+                logger.warning(f"{log_identifier} Could not decode artifact references in HTML as UTF-8, skipping artifact reference processing")
             except Exception as e:
                 logger.warning(f"{log_identifier} Error processing HTML artifact references: {e}")
 
-        # Write artifact to web server directory
-        hosted_path = web_server.host_directory / hosted_filename
-        await asyncio.to_thread(_write_file, hosted_path, artifact_bytes)
+        # Write artifact (and any referenced artifacts) to web server directory.
+        # Rewritten HTML no longer matches the stored artifact, so record no source for it
+        pending_writes.append((
+            hosted_filename,
+            artifact_bytes,
+            None if html_rewritten else (app_name, user_id, session_id, filename_base, version_to_load)
+        ))
+        await _write_hosted_files(web_server, pending_writes)
 
-        logger.info(f"{log_identifier} Artifact written to {hosted_path}")
+        logger.info(f"{log_identifier} Wrote {len(pending_writes)} file(s) to {web_server.host_directory}")
 
         # Generate URL
         url = web_server.get_url(hosted_filename, base_url)
@@ -355,13 +454,70 @@ async def host_artifact(
         return {"status": "error", "message": f"An unexpected error occurred: {e}"}
 
 
-def _write_file(path: Path, content: bytes) -> None:
+def _write_file(path: Path, content: Union[bytes, bytearray, memoryview, Iterable[bytes]]) -> str:
     """
     Write content to a file (synchronous).
 
+    Bytes-like content is written in fixed-size slices through a memoryview
+    (no intermediate copies); any other iterable of byte chunks is streamed to
+    disk as it is produced, so it never has to be held in memory at once.
+    Each slice is hashed as it is written, giving the file's ETag for free.
+
     Args:
         path: Path to write to
-        content: Content bytes
+        content: Content bytes, or an iterable of byte chunks
+
+    Returns:
+        Hex BLAKE2b digest of the written content
     """
+    hasher = hashlib.blake2b(digest_size=16)
     with open(path, 'wb') as f:
-        f.write(content)
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            with memoryview(content) as view:
+                for offset in range(0, len(view), _WRITE_CHUNK_SIZE):
+                    chunk = view[offset:offset + _WRITE_CHUNK_SIZE]
+                    hasher.update(chunk)
+                    f.write(chunk)
+        else:
+            for chunk in content:
+                hasher.update(chunk)
+                f.write(chunk)
+    return hasher.hexdigest()
+
+
+def _write_files(items: List[Tuple[Path, bytes]]) -> List[str]:
+    """
+    Write several files in one go (synchronous).
+
+    Args:
+        items: (path, content) pairs
+
+    Returns:
+        Hex BLAKE2b digest of each file's content, in order
+    """
+    return [_write_file(path, content) for path, content in items]
+
+
+async def _write_hosted_files(web_server: Any, writes: List[Tuple[str, bytes, Optional[Tuple]]]) -> None:
+    """
+    Write files to the web server directory and record them on the web server.
+
+    All files are written in a single `asyncio.to_thread` call (or inline if
+    their combined size is small), then their ETags and sources are recorded
+    and the directory listing is invalidated once.
+
+    Args:
+        web_server: The artifact web server
+        writes: (hosted_filename, content, source) for each file; source is
+            the artifact version key passed to `record_hosted`, or None
+    """
+    items = [(web_server.host_directory / hosted_filename, content) for hosted_filename, content, _ in writes]
+    if sum(len(content) for _, content in items) <= _INLINE_WRITE_MAX_BYTES:
+        digests = _write_files(items)
+    else:
+        digests = await asyncio.to_thread(_write_files, items)
+
+    for (hosted_filename, _, source), digest in zip(writes, digests):
+        web_server.record_etag(hosted_filename, digest)
+        web_server.record_hosted(hosted_filename, source)
+    web_server.invalidate_listing()
@@ -1,20 +1,205 @@
 import logging
+import os
+import re
 import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
-from flask import Flask, send_from_directory, render_template_string
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import uvicorn
+from jinja2 import Template
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, HTMLResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
 
 logger = logging.getLogger(__name__)
 
-# Global web server instance
-_web_server_instance = None
-_server_thread = None
+# Hosted files are stored flat, so a valid name is a single path component
+_SAFE_FILENAME = re.compile(r'(?!\.\.?$)[^/\\\x00]{1,255}')
+
+# Read size for streaming hosted files. Each chunk is one thread-pool read, so
+# large chunks keep big downloads bandwidth-bound (Starlette's default is 64 KiB).
+FILE_RESPONSE_CHUNK_SIZE = 1024 * 1024
+
+# Number of hosted filenames whose source artifact is remembered
+HOSTED_SOURCE_CACHE_SIZE = 512
+
+# The directory listing changes whenever an artifact is hosted
+INDEX_CACHE_CONTROL = "no-cache"
+
+HTML_INDEX_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Hosted Artifacts</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            max-width: 1200px;
+            margin: 40px auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        h1 {
+            color: #333;
+            border-bottom: 2px solid #4CAF50;
+            padding-bottom: 10px;
+        }
+        .file-list {
+            background-color: white;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            padding: 20px;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+        }
+        th {
+            background-color: #4CAF50;
+            color: white;
+            padding: 12px;
+            text-align: left;
+        }
+        td {
+            padding: 12px;
+            border-bottom: 1px solid #ddd;
+        }
+        tr:hover {
+            background-color: #f5f5f5;
+        }
+        a {
+            color: #4CAF50;
+            text-decoration: none;
+        }
+        a:hover {
+            text-decoration: underline;
+        }
+        .empty {
+            text-align: center;
+            color: #666;
+            padding: 40px;
+        }
+    </style>
+</head>
+<body>
+    <h1>Hosted Artifacts</h1>
+    <div class="file-list">
+        {% if files %}
+        <table>
+            <thead>
+                <tr>
+                    <th>Filename</th>
+                    <th>Size</th>
+                </tr>
+            </thead>
+            <tbody>
+                {% for file in files %}
+                <tr>
+                    <td><a href="/{{ file.name }}">{{ file.name }}</a></td>
+                    <td>{{ file.size_display }}</td>
+                </tr>
+                {% endfor %}
+            </tbody>
+        </table>
+        {% else %}
+        <div class="empty">No artifacts hosted yet.</div>
+        {% endif %}
+    </div>
+</body>
+</html>
+"""
+
+def is_safe_filename(filename: str) -> bool:
+    """
+    Check that a filename names a file directly inside the host directory.
+
+    Rejects empty names, '.', '..', and anything containing a path separator
+    or NUL byte, so a hosted file can never be written or served outside the
+    host directory.
+
+    Args:
+        filename: Candidate hosted filename
+
+    Returns:
+        True if the filename is a single, safe path component
+    """
+    return _SAFE_FILENAME.fullmatch(filename) is not None
+
+
+class CachingStaticFiles(StaticFiles):
+    """StaticFiles that adds Cache-Control and content-hash ETags to file responses."""
+
+    def __init__(
+        self,
+        *args,
+        cache_control: str,
+        etag_lookup: Callable[[str, os.stat_result], Optional[str]],
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+        self.etag_lookup = etag_lookup
+
+    async def get_response(self, path, scope):
+        # Hosted files are flat, so anything else is a 404 before touching the filesystem
+        if not is_safe_filename(path):
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        headers = {"Cache-Control": self.cache_control}
+        # Prefer the content hash recorded at write time over Starlette's mtime/size ETag
+        etag = self.etag_lookup(os.path.basename(full_path), stat_result)
+        if etag:
+            headers["ETag"] = etag
+
+        # FileResponse sets Content-Length, answers HEAD without a body, and
+        # hands the path to the server when it supports http.response.pathsend
+        response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        response.chunk_size = FILE_RESPONSE_CHUNK_SIZE
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def get_cache_control(cache_max_age: int) -> str:
+    """
+    Build the Cache-Control value for hosted files.
+
+    Hosted filenames are not versioned (hosting a new version overwrites the
+    file), so by default clients must revalidate; the ETag StaticFiles sends
+    turns unchanged files into 304 responses. A positive max age marks files
+    immutable for deployments that never re-host under the same name.
+
+    Args:
+        cache_max_age: Seconds clients may cache files without revalidating (0 = always revalidate)
+
+    Returns:
+        Cache-Control header value
+    """
+    if cache_max_age > 0:
+        return f"public, max-age={cache_max_age}, immutable"
+    return "public, no-cache"
 
 
 class ArtifactWebServer:
-    """Flask-based web server for hosting artifacts."""
+    """Starlette/uvicorn-based web server for hosting artifacts."""
+
+    # The process-wide instance, set by the agent's init function. A class
+    # attribute rather than a ContextVar: tools run in contexts copied long
+    # after init, which would never see a ContextVar value set there.
+    instance: Optional["ArtifactWebServer"] = None
 
-    def __init__(self, host_directory: Path, port: int = 8080, host: str = "127.0.0.1"):
+    def __init__(
+        self,
+        host_directory: Path,
+        port: int = 8080,
+        host: str = "127.0.0.1",
+        cache_max_age: int = 0,
+    ):
         """
         Initialize the artifact web server.
 
@@ -22,127 +207,169 @@ class ArtifactWebServer:
             host_directory: Directory containing files to serve
             port: Port to bind to (default: 8080)
             host: Host to bind to (default: 127.0.0.1)
+            cache_max_age: Seconds browsers may cache hosted files without revalidating (default: 0)
         """
         self.host_directory = host_directory
         self.port = port
         self.host = host
-        self.app = Flask(__name__)
+        self.cache_control = get_cache_control(cache_max_age)
         self.server_thread = None
+        self._server: Optional[uvicorn.Server] = None
+
+        # URL prefixes used by get_url: the default, and stripped custom base URLs
+        self._default_url_prefix = f"http://{self.host}:{self.port}"
+        self._url_prefixes: Dict[str, str] = {}
+
+        # Which artifact version each hosted filename currently holds (LRU)
+        self._hosted_sources: "OrderedDict[str, Hashable]" = OrderedDict()
+        self._hosted_sources_lock = threading.Lock()
 
-        # Ensure host directory exists
+        # Content-hash ETags of hosted files: filename -> (size, mtime_ns, etag)
+        self._etags: Dict[str, Tuple[int, int, str]] = {}
+
+        # Compile the listing template once rather than per request
+        self._index_template = Template(HTML_INDEX_TEMPLATE, autoescape=True)
+
+        # Rendered directory listing, keyed by (directory mtime, listing generation)
+        self._listing_cache: Optional[Tuple[Tuple[int, int], bytes]] = None
+        self._listing_generation = 0
+
+        # Ensure host directory exists (StaticFiles checks it on creation)
         self.host_directory.mkdir(parents=True, exist_ok=True)
 
         # Setup routes
-        self._setup_routes()
+        self.app = Starlette(routes=self._setup_routes())
 
         logger.info(f"[ArtifactWebServer] Initialized with directory: {host_directory}, port: {port}")
 
-    def _setup_routes(self):
-        """Setup Flask routes."""
+    def _setup_routes(self) -> list:
+        """Build the Starlette routes: directory listing plus static file mount."""
 
-        @self.app.route('/')
-        def index():
+        async def index(request):
             """Directory listing page."""
-            files = []
-            if self.host_directory.exists():
-                for file_path in sorted(self.host_directory.iterdir()):
-                    if file_path.is_file():
-                        size_bytes = file_path.stat().st_size
-                        size_mb = size_bytes / (1024 * 1024)
-                        files.append({
-                            'name': file_path.name,
-                            'size_bytes': size_bytes,
-                            'size_display': f"{size_mb:.2f} MB" if size_mb >= 1 else f"{size_bytes / 1024:.2f} KB"
-                        })
-
-            html = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Hosted Artifacts</title>
-                <style>
-                    body {
-                        font-family: Arial, sans-serif;
-                        max-width: 1200px;
-                        margin: 40px auto;
-                        padding: 20px;
-                        background-color: #f5f5f5;
-                    }
-                    h1 {
-                        color: #333;
-                        border-bottom: 2px solid #4CAF50;
-                        padding-bottom: 10px;
-                    }
-                    .file-list {
-                        background-color: white;
-                        border-radius: 8px;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                        padding: 20px;
-                    }
-                    table {
-                        width: 100%;
-                        border-collapse: collapse;
-                    }
-                    th {
-                        background-color: #4CAF50;
-                        color: white;
-                        padding: 12px;
-                        text-align: left;
-                    }
-                    td {
-                        padding: 12px;
-                        border-bottom: 1px solid #ddd;
-                    }
-                    tr:hover {
-                        background-color: #f5f5f5;
-                    }
-                    a {
-                        color: #4CAF50;
-                        text-decoration: none;
-                    }
-                    a:hover {
-                        text-decoration: underline;
-                    }
-                    .empty {
-                        text-align: center;
-                        color: #666;
-                        padding: 40px;
-                    }
-                </style>
-            </head>
-            <body>
-                <h1>Hosted Artifacts</h1>
-                <div class="file-list">
-                    {% if files %}
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Filename</th>
-                                <th>Size</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {% for file in files %}
-                            <tr>
-                                <td><a href="/{{ file.name }}">{{ file.name }}</a></td>
-                                <td>{{ file.size_display }}</td>
-                            </tr>
-                            {% endfor %}
-                        </tbody>
-                    </table>
-                    {% else %}
-                    <div class="empty">No artifacts hosted yet.</div>
-                    {% endif %}
-                </div>
-            </body>
-            </html>
-            """
-            return render_template_string(html, files=files)
-
-        @self.app.route('/<path:filename>')
-        def serve_file(filename):
-            """Serve individual files."""
-            return send_from_directory(self.host_directory, filename)
+            return HTMLResponse(
+                self._get_listing_html(),
+                headers={"Cache-Control": INDEX_CACHE_CONTROL},
+            )
+
+        return [
+            Route('/', index),
+            # Serve individual files
+            Mount('/', app=CachingStaticFiles(directory=self.host_directory, cache_control=self.cache_control, etag_lookup=self.get_etag)),
+        ]
+
+    def _render_listing(self) -> str:
+        """Scan the host directory and render the listing page."""
+        files = []
+        if self.host_directory.exists():
+            # DirEntry caches the file type from readdir, so only the size needs a stat()
+            with os.scandir(self.host_directory) as it:
+                entries = [entry for entry in it if entry.is_file()]
+            entries.sort(key=lambda entry: entry.name)
+            for entry in entries:
+                size_bytes = entry.stat().st_size
+                size_mb = size_bytes / (1024 * 1024)
+                files.append({
+                    'name': entry.name,
+                    'size_bytes': size_bytes,
+                    'size_display': f"{size_mb:.2f} MB" if size_mb >= 1 else f"{size_bytes / 1024:.2f} KB"
+                })
+
+        return self._index_template.render(files=files)
+
+    def _get_listing_html(self) -> bytes:
+        """Return the rendered listing, rescanning only when the directory has changed."""
+        try:
+            mtime_ns = self.host_directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = -1
+
+        key = (mtime_ns, self._listing_generation)
+        cached = self._listing_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        html = self._render_listing().encode('utf-8')
+        self._listing_cache = (key, html)
+        return html
+
+    def invalidate_listing(self):
+        """
+        Force the next listing request to rescan the host directory.
+
+        The directory mtime only changes when files are added or removed, so
+        call this after overwriting an existing hosted file.
+        """
+        self._listing_generation += 1
+
+    def record_etag(self, hosted_filename: str, digest: str):
+        """
+        Record the content hash of a file that was just written.
+
+        Args:
+            hosted_filename: Name of the hosted file
+            digest: Hex digest of the file content
+        """
+        try:
+            st = os.stat(self.host_directory / hosted_filename)
+        except OSError:
+            self._etags.pop(hosted_filename, None)
+            return
+        self._etags[hosted_filename] = (st.st_size, st.st_mtime_ns, f'"{digest}"')
+
+    def get_etag(self, hosted_filename: str, stat_result: os.stat_result) -> Optional[str]:
+        """
+        Get the recorded ETag of a hosted file, if it is still current.
+
+        Args:
+            hosted_filename: Name of the hosted file
+            stat_result: Current stat of the file
+
+        Returns:
+            Quoted ETag, or None if none was recorded or the file changed since
+        """
+        entry = self._etags.get(hosted_filename)
+        if entry is None:
+            return None
+        size, mtime_ns, etag = entry
+        if size != stat_result.st_size or mtime_ns != stat_result.st_mtime_ns:
+            return None
+        return etag
+
+    def is_hosted(self, hosted_filename: str, source: Hashable) -> bool:
+        """
+        Check whether a hosted file currently holds the given source artifact.
+
+        Args:
+            hosted_filename: Name of the hosted file
+            source: Key identifying the artifact version, as passed to record_hosted
+
+        Returns:
+            True if the last recorded write of hosted_filename was from source
+        """
+        with self._hosted_sources_lock:
+            if self._hosted_sources.get(hosted_filename) != source:
+                return False
+            self._hosted_sources.move_to_end(hosted_filename)
+            return True
+
+    def record_hosted(self, hosted_filename: str, source: Optional[Hashable]):
+        """
+        Record which artifact version was just written to a hosted file.
+
+        Args:
+            hosted_filename: Name of the hosted file
+            source: Key identifying the artifact version, or None if the content
+                doesn't correspond to one (e.g. rewritten HTML)
+        """
+        with self._hosted_sources_lock:
+            if source is None:
+                self._hosted_sources.pop(hosted_filename, None)
+                return
+            self._hosted_sources[hosted_filename] = source
+            self._hosted_sources.move_to_end(hosted_filename)
+            while len(self._hosted_sources) > HOSTED_SOURCE_CACHE_SIZE:
+                self._hosted_sources.popitem(last=False)
 
     def start(self):
         """Start the web server in a background thread."""
@@ -150,24 +377,45 @@ class ArtifactWebServer:
             logger.warning("[ArtifactWebServer] Server is already running")
             return
 
-        def run_server():
-            logger.info(f"[ArtifactWebServer] Starting Flask server on {self.host}:{self.port}")
-            # Disable Flask's default logging to avoid clutter
-            import logging as flask_logging
-            log = flask_logging.getLogger('werkzeug')
-            log.setLevel(flask_logging.ERROR)
+        # Quiet uvicorn's default logging to avoid clutter
+        config = uvicorn.Config(
+            self.app,
+            host=self.host,
+            port=self.port,
+            log_level="error",
+            access_log=False,
+        )
+        self._server = uvicorn.Server(config)
 
-            self.app.run(host=self.host, port=self.port, debug=False, use_reloader=False)
+        def run_server():
+            logger.info(f"[ArtifactWebServer] Starting uvicorn server on {self.host}:{self.port}")
+            # Signal handlers can only be installed from the main thread;
+            # uvicorn skips them when run from a background thread.
+            self._server.run()
 
         self.server_thread = threading.Thread(target=run_server, daemon=True)
         self.server_thread.start()
         logger.info(f"[ArtifactWebServer] Server started on http://{self.host}:{self.port}")
 
-    def stop(self):
-        """Stop the web server (note: Flask doesn't have built-in graceful shutdown)."""
-        # Flask's development server doesn't support graceful shutdown
-        # In production, you'd use a proper WSGI server like gunicorn
-        logger.info("[ArtifactWebServer] Server shutdown requested (daemon thread will stop with process)")
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the web server gracefully.
+
+        Args:
+            timeout: Seconds to wait for the server thread to exit
+        """
+        if not self._server:
+            logger.warning("[ArtifactWebServer] Server was never started")
+            return
+
+        logger.info("[ArtifactWebServer] Server shutdown requested")
+        self._server.should_exit = True
+        if self.server_thread and self.server_thread.is_alive():
+            self.server_thread.join(timeout=timeout)
+            if self.server_thread.is_alive():
+                logger.warning("[ArtifactWebServer] Server did not stop within timeout (daemon thread will stop with process)")
+                return
+        logger.info("[ArtifactWebServer] Server stopped")
 
     def get_url(self, filename: str, base_url: Optional[str] = None) -> str:
         """
@@ -182,18 +430,20 @@ class ArtifactWebServer:
         """
         if base_url:
             # Use custom base URL (for firewall/proxy scenarios)
-            return f"{base_url.rstrip('/')}/{filename}"
+            prefix = self._url_prefixes.get(base_url)
+            if prefix is None:
+                prefix = self._url_prefixes[base_url] = base_url.rstrip('/')
         else:
             # Use default localhost URL
-            return f"http://{self.host}:{self.port}/{filename}"
+            prefix = self._default_url_prefix
+        return f"{prefix}/{filename}"
 
 
 def get_web_server() -> Optional[ArtifactWebServer]:
     """Get the global web server instance."""
-    return _web_server_instance
+    return ArtifactWebServer.instance
 
 
 def set_web_server(server: ArtifactWebServer):
     """Set the global web server instance."""
-    global _web_server_instance
-    _web_server_instance = server
+    ArtifactWebServer.instance = server
@@ -0,0 +1,151 @@
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import orjson
+
+log = logging.getLogger(__name__)
+
+_LOG_ID = "[finance:cache]"
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache"), "finance"
+)
+
+
+class FileCache:
+    """
+    Persistent JSON cache for Yahoo payloads, one file per (endpoint, symbol).
+
+    Each file holds ``{"ts": <epoch seconds>, "data": {...}}``; freshness is decided
+    by the caller's TTL at read time, so one stored payload can serve endpoints with
+    different data cadences. Methods are blocking and meant to run in a worker thread.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+
+    def _path(self, endpoint: str, symbol: str) -> str:
+        key = hashlib.md5(f"{symbol}:{endpoint}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, endpoint: str, symbol: str, ttl: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        Read a cached payload.
+
+        Args:
+            endpoint: Name of the Yahoo endpoint the payload came from
+            symbol: Upper-cased ticker symbol
+            ttl: Maximum age in seconds of a payload that may be returned
+
+        Returns:
+            Tuple of (fetched_at epoch seconds, data), or None on a miss or stale entry
+        """
+        try:
+            with open(self._path(endpoint, symbol), "rb") as f:
+                entry = orjson.loads(f.read())
+            ts = float(entry["ts"])
+            data = entry["data"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.warning("%s Ignoring unreadable cache entry for %s (%s): %s", _LOG_ID, symbol, endpoint, e)
+            return None
+
+        if time.time() - ts >= ttl:
+            return None
+        return ts, data
+
+    def set(self, endpoint: str, symbol: str, data: Dict[str, Any]) -> None:
+        """
+        Store a payload, replacing any previous entry atomically.
+
+        Args:
+            endpoint: Name of the Yahoo endpoint the payload came from
+            symbol: Upper-cased ticker symbol
+            data: JSON-serialisable payload
+        """
+        path = self._path(endpoint, symbol)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps({"ts": time.time(), "data": data}, default=str))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            log.warning("%s Failed to write cache entry for %s (%s): %s", _LOG_ID, symbol, endpoint, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+class LFUCache:
+    """
+    Bounded in-memory cache evicting the least frequently used entry when full.
+
+    Hit counts decay by ``decay`` every ``decay_interval`` seconds, so symbols that
+    were popular a while ago don't pin the cache once interest moves on. Ties on
+    the decayed count evict the entry that has gone unused the longest.
+    """
+
+    def __init__(self, maxsize: int = 2048, decay: float = 0.9, decay_interval: float = 60.0):
+        self.maxsize = maxsize
+        self.decay = decay
+        self.decay_interval = decay_interval
+        # key -> [decayed hit count, last used (monotonic), value]
+        self._entries: Dict[Hashable, List[Any]] = {}
+        self._last_decay = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _age_counts(self, now: float) -> None:
+        if now - self._last_decay < self.decay_interval:
+            return
+        factor = self.decay ** int((now - self._last_decay) // self.decay_interval)
+        for entry in self._entries.values():
+            entry[0] *= factor
+        self._last_decay = now
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value and count the use, or None if the key is absent."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        self._age_counts(now)
+        entry[0] += 1
+        entry[1] = now
+        return entry[2]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, keeping the use count of an entry being refreshed."""
+        now = time.monotonic()
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            # Re-inserted so entries stay ordered by when they were last stored
+            entry[1] = now
+            entry[2] = value
+            self._entries[key] = entry
+            return
+        if len(self._entries) >= self.maxsize:
+            self._age_counts(now)
+            victim = min(self._entries, key=lambda k: (self._entries[k][0], self._entries[k][1]))
+            del self._entries[victim]
+        self._entries[key] = [1.0, now, value]
+
+    def prune_oldest(self, predicate: Callable[[Any], bool]) -> None:
+        """Drop entries, least recently stored first, until one does not match the predicate."""
+        while self._entries:
+            key = next(iter(self._entries))
+            if not predicate(self._entries[key][2]):
+                break
+            del self._entries[key]
+
+    def prune(self, predicate: Callable[[Any], bool]) -> None:
+        """Drop every entry whose value matches the predicate."""
+        for key in [k for k, entry in self._entries.items() if predicate(entry[2])]:
+            del self._entries[key]
@@ -1,11 +1,499 @@
+import asyncio
+import functools
 import logging
-from typing import Any, Dict, Optional
+import re
+import time
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from google.adk.tools import ToolContext
-import yfinance as yf
+import orjson
+from yfinance.const import _BASE_URL_, _QUERY1_URL_
+from yfinance.data import YfData
+
+from .cache import DEFAULT_CACHE_DIR, FileCache, LFUCache
 
 log = logging.getLogger(__name__)
 
+_LOG_ID_PRICE = "[finance:get_stock_price]"
+_LOG_ID_PRICES = "[finance:get_stock_prices]"
+_LOG_ID_FUNDAMENTALS = "[finance:get_stock_fundamentals]"
+
+# Characters Yahoo uses in symbols (e.g. BRK-B, ^GSPC, EURUSD=X, M&M.NS); long
+# enough for OCC option symbols, which run up to 21 characters
+_SYMBOL_RE = re.compile(r"[A-Z0-9.\-^=&]{1,24}")
+
+# How long a cached payload may be served, matched to how often the data changes
+PRICE_TTL_SECONDS = 60
+FUNDAMENTALS_TTL_SECONDS = 24 * 60 * 60
+
+# Upper bound on payloads held in memory; the least frequently used go first
+MEMORY_CACHE_SIZE = 2048
+
+# Symbols Yahoo returned no usable data for are remembered for a while, in a
+# bounded LRU so probing with junk symbols can't grow it without limit
+NEGATIVE_TTL_SECONDS = 5 * 60
+NEGATIVE_CACHE_SIZE = 10_000
+
+# Maximum number of symbols sent in one v7 quote request
+QUOTE_BATCH_SIZE = 50
+
+# Worker threads for blocking Yahoo requests. They are kept off the event loop's
+# default executor, which the host shares with every other tool. Threads rather
+# than processes: the work is waiting on the network, the narrow payloads decode
+# in microseconds, and worker processes would each need their own Yahoo session.
+FETCH_MAX_WORKERS = 32
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix="finance-fetch")
+
+# Endpoint names, used to key both the memory and the disk cache
+_QUOTE_ENDPOINT = "quote"
+_SUMMARY_ENDPOINT = "summary"
+
+_QUOTE_URL = f"{_QUERY1_URL_}/v7/finance/quote"
+_QUOTE_SUMMARY_URL = f"{_BASE_URL_}/v10/finance/quoteSummary"
+
+# Only the quoteSummary modules the fundamentals fields are read from, in order of
+# preference when a key appears in more than one
+_SUMMARY_MODULES = ("quoteType", "summaryProfile", "summaryDetail", "defaultKeyStatistics", "financialData")
+
+# Output field -> Yahoo keys to read it from, in order of preference
+FieldSpec = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+_PRICE_FIELDS: FieldSpec = (
+    ("current_price", ("regularMarketPrice", "currentPrice")),
+    ("previous_close", ("previousClose", "regularMarketPreviousClose")),
+)
+_PRICE_RANGE_FIELDS: FieldSpec = (
+    ("day_high", ("dayHigh", "regularMarketDayHigh")),
+    ("day_low", ("dayLow", "regularMarketDayLow")),
+    ("volume", ("volume", "regularMarketVolume")),
+    ("fifty_two_week_high", ("fiftyTwoWeekHigh",)),
+    ("fifty_two_week_low", ("fiftyTwoWeekLow",)),
+)
+_FUNDAMENTAL_FIELDS: FieldSpec = (
+    ("company_name", ("shortName", "longName")),
+    ("sector", ("sector",)),
+    ("industry", ("industry",)),
+    ("market_cap", ("marketCap",)),
+    ("pe_ratio", ("trailingPE",)),
+    ("forward_pe", ("forwardPE",)),
+    ("eps", ("trailingEps",)),
+    ("dividend_yield", ("dividendYield",)),
+    ("ex_dividend_date", ("exDividendDate",)),
+    ("revenue", ("totalRevenue",)),
+    ("profit_margin", ("profitMargins",)),
+    ("operating_margin", ("operatingMargins",)),
+    ("debt_to_equity", ("debtToEquity",)),
+    ("return_on_equity", ("returnOnEquity",)),
+    ("book_value", ("bookValue",)),
+)
+
+# (endpoint, symbol) -> (fetched_at, payload)
+_CACHE = LFUCache(maxsize=MEMORY_CACHE_SIZE)
+# (endpoint, symbol) -> when it was found to be invalid, oldest first
+_NEGATIVE: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+# (endpoint, symbol) -> task of a load in progress, shared by concurrent misses
+_INFLIGHT: Dict[Tuple[str, str], "asyncio.Task[Dict[str, Dict[str, Any]]]"] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_yf_data() -> YfData:
+    """
+    Get yfinance's shared Yahoo client.
+
+    YfData is a process-wide singleton holding one session, cookie and crumb for
+    every Ticker, so authentication happens once. It is deliberately never given a
+    session of our own: that would replace the shared one and force re-authentication.
+    Its curl_cffi session also impersonates a browser's TLS and HTTP/2 fingerprint,
+    which Yahoo expects; a plain HTTP client is rate limited well before that matters.
+    """
+    return YfData()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_file_cache(cache_dir: str) -> FileCache:
+    """Get the shared disk cache for a directory."""
+    return FileCache(cache_dir)
+
+
+def _fetch_quotes(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch quotes for several symbols from the v7 quote endpoint (blocking).
+
+    Goes through yfinance's shared session so the cookie and crumb are reused.
+
+    Args:
+        symbols: Upper-cased ticker symbols
+
+    Returns:
+        Dictionary mapping each symbol Yahoo knows to its quote fields
+    """
+    params = {"symbols": ",".join(symbols), "formatted": "false"}
+    response = _get_yf_data().get(_QUOTE_URL, params=params)
+    response.raise_for_status()
+    # Decode the raw body with orjson rather than going through response.json()
+    data = orjson.loads(response.content)
+    results = (data.get("quoteResponse") or {}).get("result") or []
+    return {quote["symbol"]: quote for quote in results if quote.get("symbol")}
+
+
+def _fetch_summary(symbol: str) -> Dict[str, Any]:
+    """
+    Fetch the fundamentals modules of quoteSummary for one symbol (blocking).
+
+    Args:
+        symbol: Upper-cased ticker symbol
+
+    Returns:
+        The modules merged into one flat dictionary of raw values (empty if Yahoo
+        does not know the symbol)
+    """
+    params = {
+        "modules": ",".join(_SUMMARY_MODULES),
+        "formatted": "false",
+        "corsDomain": "finance.yahoo.com",
+        "symbol": symbol,
+    }
+    response = _get_yf_data().get(f"{_QUOTE_SUMMARY_URL}/{urllib.parse.quote(symbol, safe='')}", params=params)
+    # quoteSummary answers unknown symbols with a 404
+    if response.status_code == 404:
+        return {}
+    response.raise_for_status()
+
+    results = (orjson.loads(response.content).get("quoteSummary") or {}).get("result") or []
+    summary: Dict[str, Any] = {}
+    for name in _SUMMARY_MODULES:
+        module = (results[0].get(name) if results else None) or {}
+        for key, value in module.items():
+            # Some values come back as {"raw": ..., "fmt": ...} even with formatted=false
+            if isinstance(value, dict):
+                value = value.get("raw")
+            if value is not None:
+                summary.setdefault(key, value)
+    return summary
+
+
+def _fetch_summaries(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch the fundamentals summary for each symbol (blocking)."""
+    return {symbol: _fetch_summary(symbol) for symbol in symbols}
+
+
+def _canon(symbol: str) -> Optional[str]:
+    """Normalise a user-supplied symbol, or return None if it cannot be a Yahoo symbol."""
+    sym = symbol.strip().upper()
+    return sym if _SYMBOL_RE.fullmatch(sym) else None
+
+
+def _has_price(quote: Dict[str, Any]) -> bool:
+    """Whether a quote payload carries a market price."""
+    return quote.get("regularMarketPrice") is not None
+
+
+def _has_name(info: Dict[str, Any]) -> bool:
+    """Whether a summary payload describes a known company."""
+    return bool(info.get("shortName"))
+
+
+def _remember_invalid(key: Tuple[str, str], now: float) -> None:
+    """Record that a payload came back without usable data."""
+    _NEGATIVE[key] = now
+    _NEGATIVE.move_to_end(key)
+    while len(_NEGATIVE) > NEGATIVE_CACHE_SIZE:
+        _NEGATIVE.popitem(last=False)
+
+
+def _is_known_invalid(key: Tuple[str, str], now: float) -> bool:
+    """Whether a payload was recently found to be invalid."""
+    found_at = _NEGATIVE.get(key)
+    if found_at is None:
+        return False
+    if now - found_at >= NEGATIVE_TTL_SECONDS:
+        del _NEGATIVE[key]
+        return False
+    return True
+
+
+def _evict_expired(now: float) -> None:
+    """
+    Drop cache entries too old to be served to any caller.
+
+    Both caches are ordered by when entries were stored, so eviction walks from the
+    oldest end and stops at the first live entry instead of scanning everything.
+    A payload loaded from disk is stored with its original, older timestamp and may
+    outlive its TTL a little here; reads still check the age before serving it.
+    """
+    _CACHE.prune_oldest(lambda value: now - value[0] >= FUNDAMENTALS_TTL_SECONDS)
+    while _NEGATIVE:
+        key, found_at = next(iter(_NEGATIVE.items()))
+        if now - found_at < NEGATIVE_TTL_SECONDS:
+            break
+        del _NEGATIVE[key]
+
+
+def _read_file_cache(
+    file_cache: FileCache, endpoint: str, symbols: List[str], ttl: float
+) -> Dict[str, Tuple[float, Dict[str, Any]]]:
+    """Read every fresh disk cache entry for the given symbols (blocking)."""
+    entries = {}
+    for symbol in symbols:
+        stored = file_cache.get(endpoint, symbol, ttl)
+        if stored is not None:
+            entries[symbol] = stored
+    return entries
+
+
+def _write_file_cache(file_cache: FileCache, endpoint: str, payloads: Dict[str, Dict[str, Any]]) -> None:
+    """Persist fetched payloads to the disk cache (blocking)."""
+    for symbol, payload in payloads.items():
+        # Empty payloads (unknown symbols, transient failures) are not worth persisting
+        if payload:
+            file_cache.set(endpoint, symbol, payload)
+
+
+async def _load(
+    endpoint: str,
+    symbols: List[str],
+    ttl: float,
+    fetch: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+    batch_size: int,
+    is_valid: Callable[[Dict[str, Any]], bool],
+    tool_config: Optional[Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """Load payloads missing from memory from disk or the network, updating both caches."""
+    payloads: Dict[str, Dict[str, Any]] = {}
+
+    file_cache = _get_file_cache((tool_config or {}).get("cache_dir") or DEFAULT_CACHE_DIR)
+    stored = await asyncio.to_thread(_read_file_cache, file_cache, endpoint, symbols, ttl)
+    wall_now, now = time.time(), time.monotonic()
+    for symbol, (ts, payload) in stored.items():
+        # Carry the payload's real age over so the memory TTL still counts from the fetch
+        _CACHE.set((endpoint, symbol), (now - (wall_now - ts), payload))
+        payloads[symbol] = payload
+
+    to_fetch = [symbol for symbol in symbols if symbol not in stored]
+    if to_fetch:
+        batches = [to_fetch[i:i + batch_size] for i in range(0, len(to_fetch), batch_size)]
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(_FETCH_EXECUTOR, fetch, batch) for batch in batches)
+        )
+        fetched = {symbol: {} for symbol in to_fetch}
+        for result in results:
+            fetched.update((symbol, payload) for symbol, payload in result.items() if symbol in fetched)
+
+        now = time.monotonic()
+        for symbol, payload in fetched.items():
+            if is_valid(payload):
+                _CACHE.set((endpoint, symbol), (now, payload))
+            else:
+                _remember_invalid((endpoint, symbol), now)
+                fetched[symbol] = {}
+        payloads.update(fetched)
+        await asyncio.to_thread(_write_file_cache, file_cache, endpoint, fetched)
+
+    _evict_expired(time.monotonic())
+    return payloads
+
+
+def _forget_inflight(endpoint: str, symbols: List[str], task: asyncio.Task) -> None:
+    """Unregister a finished load from every symbol it was fetching."""
+    for symbol in symbols:
+        if _INFLIGHT.get((endpoint, symbol)) is task:
+            del _INFLIGHT[(endpoint, symbol)]
+    if not task.cancelled():
+        # Mark the error as retrieved even if every caller gave up waiting
+        task.exception()
+
+
+async def _get_cached(
+    endpoint: str,
+    symbols: List[str],
+    ttl: float,
+    fetch: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+    batch_size: int,
+    is_valid: Callable[[Dict[str, Any]], bool],
+    tool_config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get Yahoo payloads for several symbols, served from cache where fresh enough.
+
+    Lookups go memory -> disk -> network, so a restarted process still avoids
+    re-fetching payloads it saw recently. Symbols missing from both caches are
+    fetched in batches of ``batch_size``, with the batches issued concurrently on
+    the fetch thread pool. A symbol already being loaded by another caller is not
+    fetched again; its in-flight result is awaited instead. Payloads failing
+    ``is_valid`` are not cached; the symbol is remembered as invalid for
+    ``NEGATIVE_TTL_SECONDS`` and served as an empty payload meanwhile.
+
+    Args:
+        endpoint: Endpoint name the payloads are cached under
+        symbols: Unique upper-cased ticker symbols
+        ttl: Maximum age in seconds of a cached payload
+        fetch: Blocking function fetching payloads for a batch of symbols
+        batch_size: Maximum number of symbols passed to one ``fetch`` call
+        is_valid: Whether a fetched payload holds usable data for the symbol
+        tool_config: Tool configuration; ``cache_dir`` overrides the disk cache location
+
+    Returns:
+        Dictionary mapping every requested symbol to its payload (empty for invalid symbols)
+    """
+    payloads: Dict[str, Dict[str, Any]] = {}
+    owned: List[str] = []
+    waiting: Dict[str, asyncio.Task] = {}
+
+    # No awaits between the cache check and registering in-flight loads, so
+    # every concurrent miss finds either a fresh entry or a pending fetch
+    now = time.monotonic()
+    for symbol in symbols:
+        key = (endpoint, symbol)
+        cached = _CACHE.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            payloads[symbol] = cached[1]
+        elif _is_known_invalid(key, now):
+            payloads[symbol] = {}
+        elif key in _INFLIGHT:
+            waiting[symbol] = _INFLIGHT[key]
+        else:
+            owned.append(symbol)
+
+    if owned:
+        # The load runs in its own task, so cancelling the caller that started it
+        # does not cancel the result other callers are waiting on
+        task = asyncio.create_task(_load(endpoint, owned, ttl, fetch, batch_size, is_valid, tool_config))
+        for symbol in owned:
+            _INFLIGHT[(endpoint, symbol)] = waiting[symbol] = task
+        task.add_done_callback(functools.partial(_forget_inflight, endpoint, owned))
+
+    for symbol, task in waiting.items():
+        # Shielded so a cancelled caller doesn't cancel the load other callers share
+        payloads[symbol] = (await asyncio.shield(task))[symbol]
+
+    return payloads
+
+
+def _compile_projection(name: str, fields: FieldSpec) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Generate a function building one result dict from a payload for a field spec.
+
+    Each output maps to the first non-None value among its source keys. The spec is
+    unrolled into a single dict display, so building a result does no per-field
+    looping or generator setup. Field names are module constants, never user input.
+
+    Args:
+        name: Name given to the generated function
+        fields: Output field -> source keys, in order of preference
+
+    Returns:
+        Function taking a payload dict and returning the projected fields
+    """
+
+    def first_of(keys: Tuple[str, ...]) -> str:
+        if len(keys) == 1:
+            return f"get({keys[0]!r})"
+        return f"(_v if (_v := get({keys[0]!r})) is not None else {first_of(keys[1:])})"
+
+    items = ",\n".join(f"        {out!r}: {first_of(keys)}" for out, keys in fields)
+    source = f"def {name}(info):\n    get = info.get\n    return {{\n{items},\n    }}\n"
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<finance projection {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+_project_price = _compile_projection("_project_price", _PRICE_FIELDS)
+_project_price_range = _compile_projection("_project_price_range", _PRICE_RANGE_FIELDS)
+_project_fundamentals = _compile_projection("_project_fundamentals", _FUNDAMENTAL_FIELDS)
+
+
+def _build_price_result(symbol: str, info: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the price fields returned for one symbol from its quote."""
+    fields = _project_price(info)
+    current_price = fields["current_price"]
+    previous_close = fields["previous_close"]
+
+    change = None
+    change_percent = None
+    if current_price and previous_close:
+        change = round(current_price - previous_close, 2)
+        change_percent = round((change / previous_close) * 100, 2)
+
+    return {
+        "symbol": symbol,
+        "current_price": current_price,
+        "previous_close": previous_close,
+        "change": change,
+        "change_percent": change_percent,
+        **_project_price_range(info),
+    }
+
+
+async def _get_quotes(
+    symbols: List[str], tool_config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Get the v7 quote for each unique upper-cased symbol, via the cache."""
+    return await _get_cached(
+        _QUOTE_ENDPOINT, symbols, PRICE_TTL_SECONDS, _fetch_quotes, QUOTE_BATCH_SIZE, _has_price, tool_config
+    )
+
+
+async def get_stock_prices(
+    symbols: List[str],
+    tool_context: Optional[ToolContext] = None,
+    tool_config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Get current stock prices and trading information for several symbols at once.
+
+    Args:
+        symbols: Stock ticker symbols (e.g., ["AAPL", "TSLA", "MSFT"])
+
+    Returns:
+        Current price, day change, volume, and 52-week range for each known symbol,
+        plus the list of symbols that could not be found
+    """
+    log.info("%s Fetching price data for symbols: %s", _LOG_ID_PRICES, symbols)
+
+    if not symbols:
+        return {"status": "error", "message": "No symbols provided"}
+
+    try:
+        canonical = [(symbol, _canon(symbol)) for symbol in symbols]
+        unique_symbols = list(dict.fromkeys(sym for _, sym in canonical if sym is not None))
+        infos = await _get_quotes(unique_symbols, tool_config) if unique_symbols else {}
+
+        quotes = {}
+        # Malformed symbols are reported without ever being sent to Yahoo
+        invalid_symbols = [symbol for symbol, sym in canonical if sym is None]
+        for symbol in unique_symbols:
+            info = infos.get(symbol)
+            if not info or info.get("regularMarketPrice") is None:
+                invalid_symbols.append(symbol)
+            else:
+                quotes[symbol] = _build_price_result(symbol, info)
+
+        if invalid_symbols:
+            log.warning("%s Invalid or unknown symbols: %s", _LOG_ID_PRICES, invalid_symbols)
+        if not quotes:
+            return {
+                "status": "error",
+                "message": f"Invalid or unknown symbols: {', '.join(invalid_symbols)}",
+            }
+
+        log.info("%s Successfully fetched prices for %s symbols", _LOG_ID_PRICES, len(quotes))
+        return {
+            "status": "success",
+            "quotes": quotes,
+            "invalid_symbols": invalid_symbols,
+        }
+
+    except Exception as e:
+        log.exception("%s Error fetching stock prices for %s: %s", _LOG_ID_PRICES, symbols, e)
+        return {
+            "status": "error",
+            "message": f"Error fetching stock prices for {symbols}: {str(e)}",
+        }
+
 
 async def get_stock_price(
     symbol: str,
@@ -21,50 +509,31 @@ async def get_stock_price(
     Returns:
         Current price, day change, volume, and 52-week range
     """
-    plugin_name = "finance"
-    log_identifier = f"[{plugin_name}:get_stock_price]"
-    log.info(f"{log_identifier} Fetching price data for symbol: {symbol}")
+    log.info("%s Fetching price data for symbol: %s", _LOG_ID_PRICE, symbol)
+
+    sym = _canon(symbol)
+    if sym is None:
+        log.warning("%s Invalid symbol format: %s", _LOG_ID_PRICE, symbol)
+        return {"status": "error", "message": f"Invalid symbol format: {symbol}"}
 
     try:
-        ticker = yf.Ticker(symbol.upper())
-        info = ticker.info
+        info = (await _get_quotes([sym], tool_config)).get(sym)
 
         # Check if we got valid data
         if not info or info.get("regularMarketPrice") is None:
-            log.warning(f"{log_identifier} Invalid or unknown symbol: {symbol}")
+            log.warning("%s Invalid or unknown symbol: %s", _LOG_ID_PRICE, symbol)
             return {
                 "status": "error",
                 "message": f"Invalid or unknown symbol: {symbol}",
             }
 
-        current_price = info.get("regularMarketPrice") or info.get("currentPrice")
-        previous_close = info.get("previousClose") or info.get("regularMarketPreviousClose")
-
-        change = None
-        change_percent = None
-        if current_price and previous_close:
-            change = round(current_price - previous_close, 2)
-            change_percent = round((change / previous_close) * 100, 2)
-
-        result = {
-            "status": "success",
-            "symbol": symbol.upper(),
-            "current_price": current_price,
-            "previous_close": previous_close,
-            "change": change,
-            "change_percent": change_percent,
-            "day_high": info.get("dayHigh") or info.get("regularMarketDayHigh"),
-            "day_low": info.get("dayLow") or info.get("regularMarketDayLow"),
-            "volume": info.get("volume") or info.get("regularMarketVolume"),
-            "fifty_two_week_high": info.get("fiftyTwoWeekHigh"),
-            "fifty_two_week_low": info.get("fiftyTwoWeekLow"),
-        }
+        result = {"status": "success", **_build_price_result(sym, info)}
 
-        log.info(f"{log_identifier} Successfully fetched price for {symbol}: ${current_price}")
+        log.info("%s Successfully fetched price for %s: $%s", _LOG_ID_PRICE, symbol, result["current_price"])
         return result
 
     except Exception as e:
-        log.exception(f"{log_identifier} Error fetching stock price for {symbol}: {e}")
+        log.exception("%s Error fetching stock price for %s: %s", _LOG_ID_PRICE, symbol, e)
         return {
             "status": "error",
             "message": f"Error fetching stock price for {symbol}: {str(e)}",
@@ -86,47 +555,34 @@ async def get_stock_fundamentals(
         Key financial metrics including P/E ratio, market cap, EPS,
         dividend yield, revenue, profit margins, and debt-to-equity ratio
     """
-    plugin_name = "finance"
-    log_identifier = f"[{plugin_name}:get_stock_fundamentals]"
-    log.info(f"{log_identifier} Fetching fundamentals for symbol: {symbol}")
+    log.info("%s Fetching fundamentals for symbol: %s", _LOG_ID_FUNDAMENTALS, symbol)
+
+    sym = _canon(symbol)
+    if sym is None:
+        log.warning("%s Invalid symbol format: %s", _LOG_ID_FUNDAMENTALS, symbol)
+        return {"status": "error", "message": f"Invalid symbol format: {symbol}"}
 
     try:
-        ticker = yf.Ticker(symbol.upper())
-        info = ticker.info
+        infos = await _get_cached(
+            _SUMMARY_ENDPOINT, [sym], FUNDAMENTALS_TTL_SECONDS, _fetch_summaries, 1, _has_name, tool_config
+        )
+        info = infos.get(sym)
 
         # Check if we got valid data
         if not info or not info.get("shortName"):
-            log.warning(f"{log_identifier} Invalid or unknown symbol: {symbol}")
+            log.warning("%s Invalid or unknown symbol: %s", _LOG_ID_FUNDAMENTALS, symbol)
             return {
                 "status": "error",
                 "message": f"Invalid or unknown symbol: {symbol}",
             }
 
-        result = {
-            "status": "success",
-            "symbol": symbol.upper(),
-            "company_name": info.get("shortName") or info.get("longName"),
-            "sector": info.get("sector"),
-            "industry": info.get("industry"),
-            "market_cap": info.get("marketCap"),
-            "pe_ratio": info.get("trailingPE"),
-            "forward_pe": info.get("forwardPE"),
-            "eps": info.get("trailingEps"),
-            "dividend_yield": info.get("dividendYield"),
-            "ex_dividend_date": info.get("exDividendDate"),
-            "revenue": info.get("totalRevenue"),
-            "profit_margin": info.get("profitMargins"),
-            "operating_margin": info.get("operatingMargins"),
-            "debt_to_equity": info.get("debtToEquity"),
-            "return_on_equity": info.get("returnOnEquity"),
-            "book_value": info.get("bookValue"),
-        }
+        result = {"status": "success", "symbol": sym, **_project_fundamentals(info)}
 
-        log.info(f"{log_identifier} Successfully fetched fundamentals for {symbol}")
+        log.info("%s Successfully fetched fundamentals for %s", _LOG_ID_FUNDAMENTALS, symbol)
         return result
 
     except Exception as e:
-        log.exception(f"{log_identifier} Error fetching fundamentals for {symbol}: {e}")
+        log.exception("%s Error fetching fundamentals for %s: %s", _LOG_ID_FUNDAMENTALS, symbol, e)
         return {
             "status": "error",
             "message": f"Error fetching fundamentals for {symbol}: {str(e)}",
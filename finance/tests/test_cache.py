@@ -0,0 +1,113 @@
+import sys
+import os
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from finance.cache import FileCache, LFUCache
+
+
+def test_file_cache_round_trip(tmp_path):
+    """Test that a stored payload is returned while fresh."""
+    cache = FileCache(str(tmp_path))
+    cache.set("info", "AAPL", {"regularMarketPrice": 123.45})
+
+    stored = cache.get("info", "AAPL", ttl=60)
+
+    assert stored is not None
+    ts, data = stored
+    assert data == {"regularMarketPrice": 123.45}
+    assert time.time() - ts < 60
+
+
+def test_file_cache_miss_and_stale(tmp_path):
+    """Test that missing and expired entries are treated as misses."""
+    cache = FileCache(str(tmp_path))
+    assert cache.get("info", "AAPL", ttl=60) is None
+
+    cache.set("info", "AAPL", {"regularMarketPrice": 1.0})
+    assert cache.get("info", "AAPL", ttl=0) is None
+
+
+def test_file_cache_keys_by_endpoint(tmp_path):
+    """Test that the same symbol under different endpoints does not collide."""
+    cache = FileCache(str(tmp_path))
+    cache.set("quote", "AAPL", {"source": "quote"})
+    cache.set("summary", "AAPL", {"source": "summary"})
+
+    assert cache.get("quote", "AAPL", ttl=60)[1] == {"source": "quote"}
+    assert cache.get("summary", "AAPL", ttl=60)[1] == {"source": "summary"}
+
+
+def test_file_cache_ignores_corrupt_entry(tmp_path):
+    """Test that an unreadable cache file is treated as a miss."""
+    cache = FileCache(str(tmp_path))
+    cache.set("info", "AAPL", {"regularMarketPrice": 1.0})
+    with open(cache._path("info", "AAPL"), "w") as f:
+        f.write("{not json")
+
+    assert cache.get("info", "AAPL", ttl=60) is None
+
+
+def test_lfu_cache_evicts_least_frequently_used():
+    """Test that a full cache evicts the entry with the fewest hits."""
+    cache = LFUCache(maxsize=2)
+    cache.set("AAPL", 1)
+    cache.set("MSFT", 2)
+    cache.get("AAPL")
+    cache.get("AAPL")
+    cache.get("MSFT")
+
+    cache.set("TSLA", 3)
+
+    assert cache.get("MSFT") is None
+    assert cache.get("AAPL") == 1
+    assert cache.get("TSLA") == 3
+
+
+def test_lfu_cache_decays_old_hits():
+    """Test that hit counts decay so formerly popular entries can be evicted."""
+    cache = LFUCache(maxsize=2, decay=0.5, decay_interval=60.0)
+    cache.set("AAPL", 1)
+    for _ in range(10):
+        cache.get("AAPL")
+    cache.set("MSFT", 2)
+
+    # An hour passes: AAPL's old hits decay away, MSFT's fresh hit counts fully
+    cache._last_decay -= 3600
+    cache.get("MSFT")
+
+    cache.set("TSLA", 3)
+
+    assert cache.get("AAPL") is None
+    assert cache.get("MSFT") == 2
+
+
+def test_lfu_cache_refresh_keeps_entry():
+    """Test that overwriting a key replaces its value without evicting anything."""
+    cache = LFUCache(maxsize=2)
+    cache.set("AAPL", 1)
+    cache.set("MSFT", 2)
+    cache.set("AAPL", 10)
+
+    assert len(cache) == 2
+    assert cache.get("AAPL") == 10
+
+    cache.prune(lambda value: value == 2)
+    assert cache.get("MSFT") is None
+
+
+def test_lfu_cache_prune_oldest_stops_at_first_live_entry():
+    """Test that pruning from the oldest end stops at the first entry that doesn't match."""
+    cache = LFUCache(maxsize=4)
+    cache.set("AAPL", 1)
+    cache.set("MSFT", 2)
+    cache.set("TSLA", 3)
+    cache.set("AAPL", 10)
+
+    cache.prune_oldest(lambda value: value < 3)
+
+    assert cache.get("MSFT") is None
+    assert cache.get("TSLA") == 3
+    assert cache.get("AAPL") == 10
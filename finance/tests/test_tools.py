@@ -1,11 +1,14 @@
+import asyncio
 import pytest
 import sys
 import os
+import time
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from finance.tools import get_stock_price, get_stock_fundamentals
+from finance import tools
+from finance.tools import get_stock_price, get_stock_prices, get_stock_fundamentals
 
 
 @pytest.mark.asyncio
@@ -44,6 +47,27 @@ async def test_get_stock_price_invalid_symbol():
     assert "Invalid" in result["message"] or "Error" in result["message"]
 
 
+@pytest.mark.asyncio
+async def test_get_stock_prices_multiple_symbols():
+    """Test get_stock_prices with several symbols, including duplicates and an invalid one."""
+    result = await get_stock_prices(["AAPL", "msft", "aapl", "INVALIDXYZ123"])
+
+    assert result["status"] == "success"
+    assert set(result["quotes"]) == {"AAPL", "MSFT"}
+    assert result["quotes"]["AAPL"]["symbol"] == "AAPL"
+    assert "current_price" in result["quotes"]["MSFT"]
+    assert result["invalid_symbols"] == ["INVALIDXYZ123"]
+
+
+@pytest.mark.asyncio
+async def test_get_stock_prices_no_symbols():
+    """Test get_stock_prices with an empty symbol list."""
+    result = await get_stock_prices([])
+
+    assert result["status"] == "error"
+    assert "message" in result
+
+
 @pytest.mark.asyncio
 async def test_get_stock_fundamentals_valid_symbol():
     """Test get_stock_fundamentals with a valid symbol."""
@@ -101,3 +125,27 @@ async def test_get_stock_fundamentals_returns_company_info():
     if result["status"] == "success":
         assert result["company_name"] is not None
         assert len(result["company_name"]) > 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_loader_does_not_cancel_waiters(tmp_path):
+    """Test that cancelling the caller that started a shared load leaves other waiters served."""
+    def slow_fetch(symbols):
+        time.sleep(0.2)
+        return {symbol: {"shortName": f"{symbol} Inc."} for symbol in symbols}
+
+    def load():
+        return tools._get_cached(
+            "test_cancel", ["ACME"], 60, slow_fetch, 1, tools._has_name, {"cache_dir": str(tmp_path)}
+        )
+
+    owner = asyncio.create_task(load())
+    await asyncio.sleep(0.05)
+    waiter = asyncio.create_task(load())
+    await asyncio.sleep(0.05)
+    owner.cancel()
+
+    result = await waiter
+
+    assert owner.cancelled()
+    assert result == {"ACME": {"shortName": "ACME Inc."}}
@@ -1,11 +1,27 @@
+"""
+ImageMagick image editing tools.
+
+Concurrent tool calls each hold a decoded copy of their image inside ImageMagick,
+whether in-process through Wand or in a `convert` subprocess, so an unbounded
+fan-out of large images can exhaust memory and push the host into swap. Jobs are
+therefore capped by a shared semaphore (`max_concurrent_procs` in tool_config, or
+the IMAGEMAGICK_MAX_PROCS environment variable, default min(CPU count, 8)):
+raising it buys throughput on many small images at the cost of peak memory.
+"""
+
 import logging
 import asyncio
+import functools
 import inspect
+import math
 import subprocess
-import tempfile
+import time
 import os
+import uuid
+import weakref
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, List
+from typing import Any, Callable, Dict, Optional, List, Sequence, Tuple
 from pathlib import Path
 
 from google.adk.tools import ToolContext
@@ -17,6 +33,823 @@ from solace_agent_mesh.agent.utils.context_helpers import get_original_session_i
 
 logger = logging.getLogger(__name__)
 
+# Run pixel operations in-process through the Wand (MagickWand) bindings when they
+# are installed, instead of paying a fork/exec of `convert` per call. Can be turned
+# off per tool with `use_wand: false` in tool_config; the CLI is always the fallback.
+USE_WAND = True
+
+DEFAULT_MAX_PROCS = int(os.environ.get("IMAGEMAGICK_MAX_PROCS", min(os.cpu_count() or 4, 8)))
+
+# Environment for convert/identify subprocesses. A one-shot process on a small image
+# gains nothing from spinning up an OpenMP thread team, and any pixel-cache spill
+# should land on tmpfs. Variables already set in the environment take precedence.
+_MAGICK_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+_MAGICK_ENV = {
+    "MAGICK_THREAD_LIMIT": "1",
+    "OMP_NUM_THREADS": "1",
+    **({"MAGICK_TMPDIR": _MAGICK_TMPDIR} if _MAGICK_TMPDIR else {}),
+    **os.environ,
+}
+
+# Created lazily so they bind to the running event loop, one per configured limit
+_JOB_SEMAPHORES: Dict[int, asyncio.Semaphore] = {}
+
+# Chained operations (crop -> resize -> convert) keep asking for the latest version of
+# the file the previous step just wrote; remember it briefly instead of re-listing.
+LATEST_VERSION_TTL_SECONDS = 2.0
+LATEST_VERSION_CACHE_SIZE = 256
+ARTIFACT_CACHE_SIZE = 16
+IMAGE_INFO_CACHE_SIZE = 1024
+
+# (app_name, user_id, session_id, filename) -> (latest version, resolved at monotonic time)
+_LATEST_VERSION_CACHE: "OrderedDict[Tuple[str, str, str, str], Tuple[int, float]]" = OrderedDict()
+# (app_name, user_id, session_id, filename, version) -> image bytes; artifact versions are immutable
+_ARTIFACT_CACHE: "OrderedDict[Tuple[str, str, str, str, int], bytes]" = OrderedDict()
+# Same key -> (parsed header fields, size in bytes) from get_image_info
+_IMAGE_INFO_CACHE: "OrderedDict[Tuple[str, str, str, str, int], Tuple[Tuple[Any, ...], int]]" = OrderedDict()
+
+# With `async_save` enabled, output saves run in the background once they take longer
+# than ASYNC_SAVE_WAIT_SECONDS, up to ASYNC_SAVE_MAX_PENDING at a time.
+ASYNC_SAVE_MAX_PENDING = 64
+ASYNC_SAVE_WAIT_SECONDS = 0.01
+
+# (app_name, user_id, session_id, filename) -> background save task, while it runs
+_PENDING_SAVES: Dict[Tuple[str, str, str, str], "asyncio.Task[Dict[str, Any]]"] = {}
+
+# artifact service -> {method name: whether it is a coroutine function}
+_ASYNC_METHODS: "weakref.WeakKeyDictionary[Any, Dict[str, bool]]" = weakref.WeakKeyDictionary()
+
+_SUPPORTED_FORMATS = frozenset({"jpg", "jpeg", "png", "gif", "webp", "bmp"})
+_SUPPORTED_FORMATS_TEXT = "jpg, jpeg, png, gif, webp, bmp"
+_JPEG_FORMATS = frozenset({"jpg", "jpeg"})
+
+_MIME_TYPE_MAP = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".bmp": "image/bmp",
+    ".webp": "image/webp",
+}
+_MIME_BY_FORMAT = {suffix[1:]: mime_type for suffix, mime_type in _MIME_TYPE_MAP.items()}
+
+# Alternate extensions mapped to the canonical format name returned by _sniff_format
+_FORMAT_ALIASES = {"jpg": "jpeg"}
+
+# ImageMagick -gravity names to Wand gravity names
+_WAND_GRAVITY = {
+    "north": "north",
+    "south": "south",
+    "east": "east",
+    "west": "west",
+    "center": "center",
+    "northeast": "north_east",
+    "northwest": "north_west",
+    "southeast": "south_east",
+    "southwest": "south_west",
+}
+_VALID_POSITIONS = frozenset(_WAND_GRAVITY)
+_VALID_POSITIONS_TEXT = ", ".join(_WAND_GRAVITY)
+
+# identify output: width|height|format|filesize|colorspace|depth|compression|quality
+_IDENTIFY_FORMAT = "%w|%h|%m|%b|%[colorspace]|%z|%C|%Q"
+
+# Wand names colorspaces and compression types in lower case; spell the common ones
+# the way identify prints them so both backends report the same values.
+_IDENTIFY_NAMES = {
+    "srgb": "sRGB",
+    "scrgb": "scRGB",
+    "gray": "Gray",
+    "ycbcr": "YCbCr",
+    "lab": "Lab",
+    "undefined": "Undefined",
+    "no": "None",
+    "zip": "Zip",
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_wand():
+    """
+    Import the Wand bindings on first use.
+
+    Returns:
+        Tuple of (Image, Drawing, Color, WandException), or None if Wand or the
+        MagickWand shared library is not installed
+    """
+    try:
+        from wand.color import Color
+        from wand.drawing import Drawing
+        from wand.exceptions import WandException
+        from wand.image import Image
+    except ImportError as e:
+        logger.info(f"[ImageMagick] Wand not available, using the convert CLI: {e}")
+        return None
+    return Image, Drawing, Color, WandException
+
+
+def _use_wand(tool_config: Optional[Dict[str, Any]]) -> bool:
+    if not (tool_config or {}).get("use_wand", USE_WAND):
+        return False
+    return _get_wand() is not None
+
+
+def _job_slot(tool_config: Optional[Dict[str, Any]]) -> asyncio.Semaphore:
+    """Semaphore bounding concurrent ImageMagick jobs, shared by tools with the same limit."""
+    limit = max(1, int((tool_config or {}).get("max_concurrent_procs", DEFAULT_MAX_PROCS)))
+    semaphore = _JOB_SEMAPHORES.get(limit)
+    if semaphore is None:
+        semaphore = _JOB_SEMAPHORES[limit] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+def _sniff_format(data: bytes) -> Optional[str]:
+    """Identify a supported image format from its magic bytes, or None if unrecognised."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data.startswith(b"BM"):
+        return "bmp"
+    return None
+
+
+# JPEG start-of-frame markers (SOF0-SOF15 minus DHT, JPG and DAC), which carry the dimensions
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:  # fill byte
+            offset += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # markers without a length
+            offset += 2
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height = int.from_bytes(data[offset + 5:offset + 7], "big")
+            width = int.from_bytes(data[offset + 7:offset + 9], "big")
+            return width, height
+        if marker == 0xDA:  # start of scan without a frame header
+            return None
+        offset += 2 + int.from_bytes(data[offset + 2:offset + 4], "big")
+    return None
+
+
+def _webp_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30 and data[23:26] == b"\x9d\x01\x2a":
+        width = int.from_bytes(data[26:28], "little") & 0x3FFF
+        height = int.from_bytes(data[28:30], "little") & 0x3FFF
+        return width, height
+    if chunk == b"VP8L" and len(data) >= 25 and data[20] == 0x2F:
+        bits = int.from_bytes(data[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(data) >= 30:
+        return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+    return None
+
+
+def _bmp_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    if len(data) < 26:
+        return None
+    if int.from_bytes(data[14:18], "little") == 12:  # OS/2 BITMAPCOREHEADER
+        return int.from_bytes(data[18:20], "little"), int.from_bytes(data[20:22], "little")
+    width = int.from_bytes(data[18:22], "little", signed=True)
+    height = int.from_bytes(data[22:26], "little", signed=True)
+    return abs(width), abs(height)  # negative height means a top-down bitmap
+
+
+def _probe_dimensions(data: bytes) -> Optional[Tuple[int, int, str]]:
+    """
+    Read an image's dimensions from its header without decoding it.
+
+    Args:
+        data: Encoded image, of which only the first few hundred bytes are usually read
+
+    Returns:
+        Tuple of (width, height, format), or None if the format is unsupported or the
+        header is truncated
+    """
+    image_format = _sniff_format(data)
+    if image_format == "png":
+        if data[12:16] != b"IHDR" or len(data) < 24:
+            return None
+        dimensions = int.from_bytes(data[16:20], "big"), int.from_bytes(data[20:24], "big")
+    elif image_format == "jpeg":
+        dimensions = _jpeg_dimensions(data)
+    elif image_format == "gif":
+        if len(data) < 10:
+            return None
+        dimensions = int.from_bytes(data[6:8], "little"), int.from_bytes(data[8:10], "little")
+    elif image_format == "webp":
+        dimensions = _webp_dimensions(data)
+    elif image_format == "bmp":
+        dimensions = _bmp_dimensions(data)
+    else:
+        return None
+    if dimensions is None:
+        return None
+    return dimensions[0], dimensions[1], image_format
+
+
+def _format_from_name(filename: str) -> Optional[str]:
+    """Image format implied by a filename's extension, or None if it has none."""
+    return Path(filename).suffix.lstrip(".").lower() or None
+
+
+def _run_wand(image_bytes: bytes, output_format: Optional[str], operation: Callable[[Any], None]) -> bytes:
+    """
+    Apply an operation to an image in-process with Wand. Blocking; run it in a worker thread.
+
+    Args:
+        image_bytes: Encoded input image
+        output_format: Format to encode the result as, or None to keep the input format
+        operation: Callable that modifies the Wand image in place
+
+    Returns:
+        The encoded output image
+
+    Raises:
+        subprocess.CalledProcessError: If ImageMagick rejects the image or operation,
+            so callers report it the same way as a failed `convert` run
+    """
+    Image, _, _, WandException = _get_wand()
+    try:
+        with Image(blob=image_bytes) as img:
+            operation(img)
+            if output_format:
+                img.format = output_format
+            return img.make_blob()
+    except WandException as e:
+        raise subprocess.CalledProcessError(1, ["wand"], stderr=str(e)) from e
+
+
+def _wand_crop(img, x_offset: int, y_offset: int, width: int, height: int) -> None:
+    img.crop(x_offset, y_offset, width=width, height=height)
+    img.reset_coords()
+
+
+def _geometry_size(width: int, height: int, geometry: str) -> Tuple[int, int]:
+    """
+    Target size for a _resize_geometry string, rounded the way ImageMagick rounds it.
+
+    Args:
+        width: Current image width in pixels
+        height: Current image height in pixels
+        geometry: "50%", "800x", "x600", "800x600" (fit inside), or "800x600!" (exact)
+
+    Returns:
+        Tuple of (width, height), each at least 1
+    """
+    if geometry.endswith("%"):
+        scale = float(geometry[:-1]) / 100.0
+    else:
+        target_w, _, target_h = geometry.rstrip("!").partition("x")
+        if geometry.endswith("!"):
+            return max(1, int(target_w)), max(1, int(target_h))
+        if target_w and target_h:
+            scale = min(int(target_w) / width, int(target_h) / height)
+        elif target_w:
+            scale = int(target_w) / width
+        else:
+            scale = int(target_h) / height
+    return max(1, math.floor(width * scale + 0.5)), max(1, math.floor(height * scale + 0.5))
+
+
+def _wand_resize(img, geometry: str) -> None:
+    img.resize(*_geometry_size(img.width, img.height, geometry))
+
+
+def _wand_quality(img, quality: Optional[int]) -> None:
+    if quality:
+        img.compression_quality = quality
+
+
+def _wand_annotate(
+    img, text: str, position: str, font_size: int, font_color: str, background_color: Optional[str]
+) -> None:
+    _, Drawing, Color, _ = _get_wand()
+    if background_color:
+        img.background_color = Color(background_color)
+    with Drawing() as draw:
+        draw.fill_color = Color(font_color)
+        draw.font_size = font_size
+        draw.gravity = _WAND_GRAVITY[position]
+        draw.text(0, 0, text)
+        draw(img)
+
+
+def _wand_chain(img, operations: List[Callable[[Any], None]]) -> None:
+    for operation in operations:
+        operation(img)
+
+
+def _identify_name(name: str) -> str:
+    return _IDENTIFY_NAMES.get(name, name.upper())
+
+
+def _format_blob_size(size: int) -> str:
+    """Format a byte count the way identify's %b does (e.g. "812B", "1.5625KiB")."""
+    units = ("B", "KiB", "MiB", "GiB")
+    value, index = float(size), 0
+    while value >= 1024 and index < len(units) - 1:
+        value /= 1024
+        index += 1
+    return f"{value:.6g}{units[index]}"
+
+
+def _wand_identify(image_bytes: bytes) -> Tuple[int, int, str, str, str, Optional[int], str, Optional[int]]:
+    """
+    Read an image's header in-process with Wand, without decoding pixels. Blocking;
+    run it in a worker thread.
+
+    Args:
+        image_bytes: Encoded image
+
+    Returns:
+        Tuple of (width, height, format, file size, colorspace, bit depth, compression,
+        quality), spelled as `identify` prints them
+
+    Raises:
+        subprocess.CalledProcessError: If ImageMagick cannot read the image
+    """
+    Image, _, _, WandException = _get_wand()
+    try:
+        with Image.ping(blob=image_bytes) as img:
+            return (
+                img.width,
+                img.height,
+                img.format,
+                _format_blob_size(len(image_bytes)),
+                _identify_name(img.colorspace),
+                img.depth,
+                _identify_name(img.compression),
+                img.compression_quality,
+            )
+    except WandException as e:
+        raise subprocess.CalledProcessError(1, ["wand"], stderr=str(e)) from e
+
+
+def _parse_identify(output: str) -> Tuple[int, int, str, str, str, Optional[int], str, Optional[int]]:
+    """Parse `identify -format _IDENTIFY_FORMAT` output into the tuple _wand_identify returns."""
+    try:
+        width, height, image_format, file_size, colorspace, depth, compression, *rest = output.split('|')
+        width, height = int(width), int(height)
+    except ValueError:
+        raise Exception(f"Unexpected identify output format: {output}") from None
+
+    bit_depth = int(depth) if depth.isdigit() else None
+    quality = int(rest[0]) if rest and rest[0].isdigit() else None
+    return width, height, image_format, file_size, colorspace, bit_depth, compression, quality
+
+
+def _resize_geometry(
+    width: Optional[int], height: Optional[int], percentage: Optional[int], maintain_aspect_ratio: bool
+) -> str:
+    """Build an ImageMagick resize geometry; at least one of the sizes must be set."""
+    if percentage:
+        return f"{percentage}%"
+    elif width and height:
+        if maintain_aspect_ratio:
+            return f"{width}x{height}"
+        return f"{width}x{height}!"
+    elif width:
+        return f"{width}x"
+    else:  # height only
+        return f"x{height}"
+
+
+def _annotate_args(
+    text: str, position: str, font_size: int, font_color: str, background_color: Optional[str]
+) -> List[str]:
+    """Build `convert` arguments for a text overlay, adding background color if specified."""
+    args = ["-background", background_color] if background_color else []
+    args.extend([
+        "-fill", font_color,
+        "-pointsize", str(font_size),
+        "-gravity", position,
+        "-annotate", "+0+0", text
+    ])
+    return args
+
+
+def _compile_operation(operation: Dict[str, Any]) -> Tuple[List[str], Callable[[Any], None], str]:
+    """
+    Translate one transform_image operation into `convert` arguments and a Wand step.
+
+    Args:
+        operation: Operation dict, e.g. {"op": "resize", "percentage": 50}
+
+    Returns:
+        Tuple of (convert arguments, Wand operation, short description)
+
+    Raises:
+        ValueError: If the operation is unknown or its parameters are invalid
+    """
+    kind = str(operation.get("op", "")).lower()
+
+    if kind == "crop":
+        if not operation.get("width") or not operation.get("height"):
+            raise ValueError("crop requires width and height")
+        width, height = int(operation["width"]), int(operation["height"])
+        x_offset, y_offset = int(operation.get("x_offset", 0)), int(operation.get("y_offset", 0))
+        geometry = f"{width}x{height}+{x_offset}+{y_offset}"
+        wand_step = functools.partial(
+            _wand_crop, x_offset=x_offset, y_offset=y_offset, width=width, height=height
+        )
+        return ["-crop", geometry, "+repage"], wand_step, f"crop {geometry}"
+
+    if kind == "resize":
+        width, height, percentage = (
+            int(operation[key]) if operation.get(key) else None for key in ("width", "height", "percentage")
+        )
+        if not percentage and not width and not height:
+            raise ValueError("resize requires percentage, width, or height")
+        geometry = _resize_geometry(width, height, percentage, operation.get("maintain_aspect_ratio", True))
+        return ["-resize", geometry], functools.partial(_wand_resize, geometry=geometry), f"resize {geometry}"
+
+    if kind == "text":
+        text = operation.get("text")
+        if not text:
+            raise ValueError("text requires text")
+        position = str(operation.get("position", "south")).lower()
+        if position not in _VALID_POSITIONS:
+            raise ValueError(f"invalid position '{position}'. Valid: {_VALID_POSITIONS_TEXT}")
+        font_size = int(operation.get("font_size", 32))
+        font_color = operation.get("font_color", "white")
+        background_color = operation.get("background_color")
+        wand_step = functools.partial(
+            _wand_annotate,
+            text=text,
+            position=position,
+            font_size=font_size,
+            font_color=font_color,
+            background_color=background_color,
+        )
+        args = _annotate_args(text, position, font_size, font_color, background_color)
+        return args, wand_step, f"text '{text}' at {position}"
+
+    raise ValueError(f"unknown operation '{kind}'. Supported: crop, resize, text")
+
+
+async def _run_command(cmd: Tuple[str, ...], input_bytes: Optional[bytes], log_identifier: str) -> bytes:
+    """
+    Run an ImageMagick command as a native asyncio subprocess.
+
+    Unlike subprocess.run in a worker thread, waiting on the process does not hold
+    an executor thread, so concurrent tool calls are not capped by the pool size.
+
+    Args:
+        cmd: Command and arguments
+        input_bytes: Data to write to the process's stdin, or None for no input
+        log_identifier: Prefix for log messages
+
+    Returns:
+        The process's stdout
+
+    Raises:
+        subprocess.CalledProcessError: If the command exits with an error
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"{log_identifier} Running command: {' '.join(cmd)}")
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if input_bytes is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=_MAGICK_ENV,
+    )
+    stdout, stderr = await proc.communicate(input_bytes)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(
+            proc.returncode, cmd, stdout, stderr.decode("utf-8", errors="replace")
+        )
+    return stdout
+
+
+async def _call_service(artifact_service, method_name: str, **kwargs) -> Any:
+    """
+    Call an artifact service method, in a worker thread if it is synchronous.
+
+    Whether each method is a coroutine function is decided once per service instance,
+    since inspect.iscoroutinefunction is comparatively costly on every call.
+    """
+    method = getattr(artifact_service, method_name)
+    try:
+        kinds = _ASYNC_METHODS.setdefault(artifact_service, {})
+    except TypeError:  # not weak-referenceable
+        kinds = {}
+    is_async = kinds.get(method_name)
+    if is_async is None:
+        is_async = kinds[method_name] = inspect.iscoroutinefunction(method)
+    if is_async:
+        return await method(**kwargs)
+    return await asyncio.to_thread(method, **kwargs)
+
+
+async def _resolve_version(artifact_service, app_name: str, user_id: str, session_id: str, filename: str) -> int:
+    """
+    Get the latest version of an artifact, reusing a lookup made in the last few seconds.
+
+    Raises:
+        FileNotFoundError: If the artifact has no versions
+    """
+    key = (app_name, user_id, session_id, filename)
+    cached = _LATEST_VERSION_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[1] < LATEST_VERSION_TTL_SECONDS:
+        return cached[0]
+
+    versions = await _call_service(
+        artifact_service, "list_versions",
+        app_name=app_name, user_id=user_id, session_id=session_id, filename=filename
+    )
+    if not versions:
+        raise FileNotFoundError(f"Image artifact '{filename}' not found.")
+
+    version = max(versions)
+    _remember_version(key, version)
+    return version
+
+
+async def _load_image_bytes(
+    artifact_service, app_name: str, user_id: str, session_id: str, filename: str, version: int
+) -> bytes:
+    """
+    Load an artifact version's content, from the recently used artifacts when possible.
+
+    Raises:
+        FileNotFoundError: If the artifact version has no content
+    """
+    key = (app_name, user_id, session_id, filename, version)
+    image_bytes = _ARTIFACT_CACHE.get(key)
+    if image_bytes is not None:
+        _ARTIFACT_CACHE.move_to_end(key)
+        return image_bytes
+
+    image_artifact = await _call_service(
+        artifact_service, "load_artifact",
+        app_name=app_name, user_id=user_id, session_id=session_id,
+        filename=filename, version=version
+    )
+
+    if not image_artifact or not image_artifact.inline_data:
+        raise FileNotFoundError(f"Content for '{filename}' v{version} not found.")
+
+    image_bytes = image_artifact.inline_data.data
+    _remember_artifact(key, image_bytes)
+    return image_bytes
+
+
+async def _resolve_target(
+    tool_context: ToolContext, image_filename: str
+) -> Tuple[str, int, str, str, str, Any]:
+    """
+    Resolve the invocation context and the artifact version to work on, without loading it.
+
+    Args:
+        tool_context: Framework context for accessing artifact service
+        image_filename: Input image filename with optional version (e.g., "photo.jpg:2")
+
+    Returns:
+        Tuple of (filename_base, version, app_name, user_id, session_id, artifact_service)
+
+    Raises:
+        ValueError: If the invocation context is incomplete
+        FileNotFoundError: If the artifact does not exist
+    """
+    inv_context = tool_context._invocation_context
+    if not inv_context:
+        raise ValueError("InvocationContext is not available.")
+
+    app_name = getattr(inv_context, "app_name", None)
+    user_id = getattr(inv_context, "user_id", None)
+    session_id = get_original_session_id(inv_context)
+    artifact_service = getattr(inv_context, "artifact_service", None)
+
+    if not app_name or not user_id or not session_id or not artifact_service:
+        raise ValueError("Missing required context parts")
+
+    # Parse input filename and version
+    parts = image_filename.rsplit(":", 1)
+    filename_base = parts[0]
+    version_str = parts[1] if len(parts) > 1 else None
+    version_to_load = int(version_str) if version_str else None
+
+    # A chained call may target an output whose save is still running in the background
+    await _wait_for_pending_save((app_name, user_id, session_id, filename_base))
+
+    if version_to_load is None:
+        version_to_load = await _resolve_version(
+            artifact_service, app_name, user_id, session_id, filename_base
+        )
+    return filename_base, version_to_load, app_name, user_id, session_id, artifact_service
+
+
+async def _prepare(
+    tool_context: ToolContext, image_filename: str
+) -> Tuple[bytes, str, int, str, str, str, Any]:
+    """
+    Resolve the invocation context and load the requested image artifact.
+
+    Args:
+        tool_context: Framework context for accessing artifact service
+        image_filename: Input image filename with optional version (e.g., "photo.jpg:2")
+
+    Returns:
+        Tuple of (image_bytes, filename_base, version, app_name, user_id, session_id, artifact_service)
+
+    Raises:
+        ValueError: If the invocation context is incomplete
+        FileNotFoundError: If the artifact or its content does not exist
+    """
+    (
+        filename_base, version_to_load, app_name, user_id, session_id, artifact_service
+    ) = await _resolve_target(tool_context, image_filename)
+    image_bytes = await _load_image_bytes(
+        artifact_service, app_name, user_id, session_id, filename_base, version_to_load
+    )
+    return image_bytes, filename_base, version_to_load, app_name, user_id, session_id, artifact_service
+
+
+async def _wait_for_pending_save(key: Tuple[str, str, str, str]) -> None:
+    """Wait until a background save of this artifact, if any, has finished."""
+    task = _PENDING_SAVES.get(key)
+    if task is not None:
+        await asyncio.wait({task})
+
+
+def _finish_save(key: Tuple[str, str, str, str], save_result: Dict[str, Any], content_bytes: bytes) -> Dict[str, Any]:
+    if save_result.get("status") == "error":
+        raise Exception(f"Failed to save artifact: {save_result.get('message')}")
+    _remember_saved(*key, save_result["data_version"], content_bytes)
+    return save_result
+
+
+def _on_background_save_done(
+    key: Tuple[str, str, str, str],
+    content_bytes: bytes,
+    log_identifier: str,
+    save_task_id: str,
+    task: "asyncio.Task[Dict[str, Any]]",
+) -> None:
+    if _PENDING_SAVES.get(key) is task:
+        del _PENDING_SAVES[key]
+    if task.cancelled():
+        logger.error(f"{log_identifier} Background save {save_task_id} of {key[3]} was cancelled")
+        return
+    try:
+        save_result = _finish_save(key, task.result(), content_bytes)
+    except Exception as e:
+        logger.error(f"{log_identifier} Background save {save_task_id} of {key[3]} failed: {e}")
+        return
+    logger.info(f"{log_identifier} Background save {save_task_id} stored {key[3]} v{save_result['data_version']}")
+
+
+async def _save_output(
+    artifact_service,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    filename: str,
+    content_bytes: bytes,
+    mime_type: str,
+    metadata_dict: Dict[str, Any],
+    timestamp: datetime,
+    tool_context: ToolContext,
+    tool_config: Optional[Dict[str, Any]],
+    log_identifier: str,
+) -> Dict[str, Any]:
+    """
+    Save a tool's output artifact.
+
+    With `async_save: true` in tool_config, a save still running after
+    `async_save_wait_seconds` continues in the background and the returned result has
+    status "success_pending", a save_task_id, and a data_version of None. Later tool
+    calls on the same file wait for it first. Once ASYNC_SAVE_MAX_PENDING saves are in
+    the background, callers wait for their own save, so a slow artifact service pushes
+    back instead of piling up work.
+
+    Returns:
+        The save result, including data_version once the save has completed
+
+    Raises:
+        Exception: If the artifact service reports a failed save
+    """
+    key = (app_name, user_id, session_id, filename)
+    # Versions are assigned in save order, so never overtake a pending save of this file
+    await _wait_for_pending_save(key)
+
+    save = save_artifact_with_metadata(
+        artifact_service=artifact_service,
+        app_name=app_name,
+        user_id=user_id,
+        session_id=session_id,
+        filename=filename,
+        content_bytes=content_bytes,
+        mime_type=mime_type,
+        metadata_dict=metadata_dict,
+        timestamp=timestamp,
+        schema_max_keys=DEFAULT_SCHEMA_MAX_KEYS,
+        tool_context=tool_context,
+    )
+
+    config = tool_config or {}
+    if not config.get("async_save", False) or len(_PENDING_SAVES) >= ASYNC_SAVE_MAX_PENDING:
+        return _finish_save(key, await save, content_bytes)
+
+    task = asyncio.create_task(save)
+    done, _ = await asyncio.wait({task}, timeout=config.get("async_save_wait_seconds", ASYNC_SAVE_WAIT_SECONDS))
+    if done:
+        return _finish_save(key, task.result(), content_bytes)
+
+    save_task_id = uuid.uuid4().hex
+    _PENDING_SAVES[key] = task
+    task.add_done_callback(
+        functools.partial(_on_background_save_done, key, content_bytes, log_identifier, save_task_id)
+    )
+    logger.info(f"{log_identifier} Saving {filename} in the background ({save_task_id})")
+    return {"status": "success_pending", "data_version": None, "save_task_id": save_task_id}
+
+
+def _pending_fields(save_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Result fields that mark a tool's output as still being saved, if it is."""
+    if save_result.get("status") != "success_pending":
+        return {}
+    return {"status": "success_pending", "save_task_id": save_result["save_task_id"]}
+
+
+def _remember_version(key: Tuple[str, str, str, str], version: int) -> None:
+    _LATEST_VERSION_CACHE[key] = (version, time.monotonic())
+    _LATEST_VERSION_CACHE.move_to_end(key)
+    while len(_LATEST_VERSION_CACHE) > LATEST_VERSION_CACHE_SIZE:
+        _LATEST_VERSION_CACHE.popitem(last=False)
+
+
+def _remember_artifact(key: Tuple[str, str, str, str, int], image_bytes: bytes) -> None:
+    _ARTIFACT_CACHE[key] = image_bytes
+    _ARTIFACT_CACHE.move_to_end(key)
+    while len(_ARTIFACT_CACHE) > ARTIFACT_CACHE_SIZE:
+        _ARTIFACT_CACHE.popitem(last=False)
+
+
+def _remember_image_info(
+    key: Tuple[str, str, str, str, int], info: Tuple[Any, ...], file_size_bytes: int
+) -> None:
+    _IMAGE_INFO_CACHE[key] = (info, file_size_bytes)
+    _IMAGE_INFO_CACHE.move_to_end(key)
+    while len(_IMAGE_INFO_CACHE) > IMAGE_INFO_CACHE_SIZE:
+        _IMAGE_INFO_CACHE.popitem(last=False)
+
+
+def _remember_saved(app_name: str, user_id: str, session_id: str, filename: str, version: int, data: bytes) -> None:
+    """Record a just-saved output so the next step in a chain neither lists nor reloads it."""
+    _remember_version((app_name, user_id, session_id, filename), version)
+    _remember_artifact((app_name, user_id, session_id, filename, version), data)
+
+
+def _pipe_spec(image_format: Optional[str]) -> str:
+    """ImageMagick stdin/stdout file spec, with an explicit format prefix when known."""
+    return f"{image_format}:-" if image_format else "-"
+
+
+async def _run_convert(
+    image_bytes: bytes,
+    input_format: Optional[str],
+    output_format: Optional[str],
+    args: Sequence[str],
+    log_identifier: str,
+) -> bytes:
+    """
+    Run the `convert` CLI on an image, piping it through stdin and stdout.
+
+    Args:
+        image_bytes: Encoded input image
+        input_format: Input format sniffed from the image bytes (e.g. "png"), or None to
+            let ImageMagick detect it. Never taken from the filename, which may be wrong
+        output_format: Format to encode the result as, or None to keep the input format
+        args: Operation arguments placed between the input and output specs
+        log_identifier: Prefix for log messages
+
+    Returns:
+        The encoded output image
+
+    Raises:
+        subprocess.CalledProcessError: If ImageMagick exits with an error
+    """
+    cmd = ("convert", _pipe_spec(input_format), *args, _pipe_spec(output_format))
+    return await _run_command(cmd, image_bytes, log_identifier)
+
 
 async def crop_image(
     image_filename: str,
@@ -52,160 +885,103 @@ async def crop_image(
         return {"status": "error", "message": "ToolContext is missing."}
 
     try:
-        # Extract invocation context
-        inv_context = tool_context._invocation_context
-        if not inv_context:
-            raise ValueError("InvocationContext is not available.")
-
-        app_name = getattr(inv_context, "app_name", None)
-        user_id = getattr(inv_context, "user_id", None)
-        session_id = get_original_session_id(inv_context)
-        artifact_service = getattr(inv_context, "artifact_service", None)
-
-        if not all([app_name, user_id, session_id, artifact_service]):
-            raise ValueError("Missing required context parts")
-
-        # Parse input filename and version
-        parts = image_filename.rsplit(":", 1)
-        filename_base = parts[0]
-        version_str = parts[1] if len(parts) > 1 else None
-        version_to_load = int(version_str) if version_str else None
-
-        # Get latest version if not specified
-        if version_to_load is None:
-            list_versions_method = getattr(artifact_service, "list_versions")
-            if inspect.iscoroutinefunction(list_versions_method):
-                versions = await list_versions_method(
-                    app_name=app_name,
-                    user_id=user_id,
-                    session_id=session_id,
-                    filename=filename_base,
-                )
+        (
+            image_bytes, filename_base, version_to_load, app_name, user_id, session_id, artifact_service
+        ) = await _prepare(tool_context, image_filename)
+
+        # Reject a crop that starts outside the image before running ImageMagick
+        probed = _probe_dimensions(image_bytes)
+        if probed is not None:
+            source_width, source_height, _ = probed
+            if x_offset >= source_width or y_offset >= source_height:
+                return {
+                    "status": "error",
+                    "message": (
+                        f"Crop offset +{x_offset}+{y_offset} is outside the "
+                        f"{source_width}x{source_height} image"
+                    ),
+                }
+
+        # Determine output filename
+        if not output_filename:
+            name_parts = filename_base.rsplit(".", 1)
+            if len(name_parts) == 2:
+                output_filename = f"{name_parts[0]}_cropped.{name_parts[1]}"
             else:
-                versions = await asyncio.to_thread(
-                    list_versions_method,
-                    app_name=app_name,
-                    user_id=user_id,
-                    session_id=session_id,
-                    filename=filename_base,
-                )
-            if not versions:
-                raise FileNotFoundError(f"Image artifact '{filename_base}' not found.")
-            version_to_load = max(versions)
-
-        # Load image artifact
-        load_artifact_method = getattr(artifact_service, "load_artifact")
-        if inspect.iscoroutinefunction(load_artifact_method):
-            image_artifact = await load_artifact_method(
-                app_name=app_name,
-                user_id=user_id,
-                session_id=session_id,
-                filename=filename_base,
-                version=version_to_load,
-            )
+                output_filename = f"{filename_base}_cropped"
+
+        crop_geometry = f"{width}x{height}+{x_offset}+{y_offset}"
+        output_format = _format_from_name(output_filename)
+        if (
+            probed is not None
+            and x_offset == 0
+            and y_offset == 0
+            and width >= probed[0]
+            and height >= probed[1]
+            and (output_format is None or _FORMAT_ALIASES.get(output_format, output_format) == probed[2])
+        ):
+            # The crop keeps the whole image in its current format: re-save the original bytes
+            logger.debug(f"{log_identifier} Crop covers the whole image, skipping ImageMagick")
+            output_bytes = image_bytes
         else:
-            image_artifact = await asyncio.to_thread(
-                load_artifact_method,
-                app_name=app_name,
-                user_id=user_id,
-                session_id=session_id,
-                filename=filename_base,
-                version=version_to_load,
-            )
-
-        if not image_artifact or not image_artifact.inline_data:
-            raise FileNotFoundError(f"Content for '{filename_base}' v{version_to_load} not found.")
-
-        image_bytes = image_artifact.inline_data.data
-
-        # Create temporary files for input and output
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename_base).suffix) as tmp_input:
-            tmp_input.write(image_bytes)
-            tmp_input_path = tmp_input.name
-
-        try:
-            # Determine output filename
-            if not output_filename:
-                name_parts = filename_base.rsplit(".", 1)
-                if len(name_parts) == 2:
-                    output_filename = f"{name_parts[0]}_cropped.{name_parts[1]}"
+            async with _job_slot(tool_config):
+                if _use_wand(tool_config):
+                    output_bytes = await asyncio.to_thread(
+                        _run_wand,
+                        image_bytes,
+                        output_format,
+                        functools.partial(
+                            _wand_crop, x_offset=x_offset, y_offset=y_offset, width=width, height=height
+                        ),
+                    )
                 else:
-                    output_filename = f"{filename_base}_cropped"
-
-            tmp_output_path = tempfile.mktemp(suffix=Path(output_filename).suffix)
-
-            # Run ImageMagick crop command
-            crop_geometry = f"{width}x{height}+{x_offset}+{y_offset}"
-            cmd = ["convert", tmp_input_path, "-crop", crop_geometry, "+repage", tmp_output_path]
-
-            logger.debug(f"{log_identifier} Running command: {' '.join(cmd)}")
-            result = await asyncio.to_thread(
-                subprocess.run,
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-
-            # Read the output file
-            with open(tmp_output_path, "rb") as f:
-                output_bytes = f.read()
-
-            # Determine MIME type
-            suffix = Path(output_filename).suffix.lower()
-            mime_type_map = {
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".png": "image/png",
-                ".gif": "image/gif",
-                ".bmp": "image/bmp",
-                ".webp": "image/webp",
-            }
-            mime_type = mime_type_map.get(suffix, "application/octet-stream")
-
-            # Save output artifact
-            timestamp = datetime.now(timezone.utc)
-            metadata_dict = {
-                "description": f"Cropped image from {filename_base}",
-                "source_tool": "crop_image",
-                "source_filename": filename_base,
-                "source_version": version_to_load,
-                "crop_geometry": crop_geometry,
-                "creation_timestamp_iso": timestamp.isoformat(),
-            }
-
-            save_result = await save_artifact_with_metadata(
-                artifact_service=artifact_service,
-                app_name=app_name,
-                user_id=user_id,
-                session_id=session_id,
-                filename=output_filename,
-                content_bytes=output_bytes,
-                mime_type=mime_type,
-                metadata_dict=metadata_dict,
-                timestamp=timestamp,
-                schema_max_keys=DEFAULT_SCHEMA_MAX_KEYS,
-                tool_context=tool_context,
-            )
-
-            if save_result.get("status") == "error":
-                raise Exception(f"Failed to save artifact: {save_result.get('message')}")
-
-            logger.info(f"{log_identifier} Successfully cropped image to {output_filename}")
-            return {
-                "status": "success",
-                "message": f"Image cropped successfully to {width}x{height}+{x_offset}+{y_offset}",
-                "output_filename": output_filename,
-                "output_version": save_result["data_version"],
-                "crop_geometry": crop_geometry,
-            }
+                    output_bytes = await _run_convert(
+                        image_bytes,
+                        _sniff_format(image_bytes),
+                        output_format,
+                        ("-crop", crop_geometry, "+repage"),
+                        log_identifier,
+                    )
+
+        # Determine MIME type
+        suffix = Path(output_filename).suffix.lower()
+        mime_type = _MIME_TYPE_MAP.get(suffix, "application/octet-stream")
+
+        # Save output artifact
+        timestamp = datetime.now(timezone.utc)
+        metadata_dict = {
+            "description": f"Cropped image from {filename_base}",
+            "source_tool": "crop_image",
+            "source_filename": filename_base,
+            "source_version": version_to_load,
+            "crop_geometry": crop_geometry,
+            "creation_timestamp_iso": timestamp.isoformat(),
+        }
 
-        finally:
-            # Clean up temporary files
-            if os.path.exists(tmp_input_path):
-                os.unlink(tmp_input_path)
-            if os.path.exists(tmp_output_path):
-                os.unlink(tmp_output_path)
+        save_result = await _save_output(
+            artifact_service,
+            app_name,
+            user_id,
+            session_id,
+            output_filename,
+            output_bytes,
+            mime_type,
+            metadata_dict,
+            timestamp,
+            tool_context,
+            tool_config,
+            log_identifier,
+        )
+
+        logger.info(f"{log_identifier} Successfully cropped image to {output_filename}")
+        return {
+            "status": "success",
+            "message": f"Image cropped successfully to {width}x{height}+{x_offset}+{y_offset}",
+            "output_filename": output_filename,
+            "output_version": save_result["data_version"],
+            "crop_geometry": crop_geometry,
+            **_pending_fields(save_result),
+        }
 
     except subprocess.CalledProcessError as e:
         logger.error(f"{log_identifier} ImageMagick command failed: {e.stderr}")
@@ -258,146 +1034,75 @@ async def resize_image(
         }
 
     try:
-        # Extract invocation context
-        inv_context = tool_context._invocation_context
-        if not inv_context:
-            raise ValueError("InvocationContext is not available.")
-
-        app_name = getattr(inv_context, "app_name", None)
-        user_id = getattr(inv_context, "user_id", None)
-        session_id = get_original_session_id(inv_context)
-        artifact_service = getattr(inv_context, "artifact_service", None)
-
-        if not all([app_name, user_id, session_id, artifact_service]):
-            raise ValueError("Missing required context parts")
-
-        # Parse input filename and load image (same as crop_image)
-        parts = image_filename.rsplit(":", 1)
-        filename_base = parts[0]
-        version_str = parts[1] if len(parts) > 1 else None
-        version_to_load = int(version_str) if version_str else None
-
-        if version_to_load is None:
-            list_versions_method = getattr(artifact_service, "list_versions")
-            if inspect.iscoroutinefunction(list_versions_method):
-                versions = await list_versions_method(
-                    app_name=app_name, user_id=user_id, session_id=session_id, filename=filename_base
-                )
+        (
+            image_bytes, filename_base, version_to_load, app_name, user_id, session_id, artifact_service
+        ) = await _prepare(tool_context, image_filename)
+
+        if not output_filename:
+            name_parts = filename_base.rsplit(".", 1)
+            if len(name_parts) == 2:
+                output_filename = f"{name_parts[0]}_resized.{name_parts[1]}"
             else:
-                versions = await asyncio.to_thread(
-                    list_versions_method, app_name=app_name, user_id=user_id, session_id=session_id, filename=filename_base
-                )
-            if not versions:
-                raise FileNotFoundError(f"Image artifact '{filename_base}' not found.")
-            version_to_load = max(versions)
-
-        load_artifact_method = getattr(artifact_service, "load_artifact")
-        if inspect.iscoroutinefunction(load_artifact_method):
-            image_artifact = await load_artifact_method(
-                app_name=app_name, user_id=user_id, session_id=session_id,
-                filename=filename_base, version=version_to_load
-            )
-        else:
-            image_artifact = await asyncio.to_thread(
-                load_artifact_method, app_name=app_name, user_id=user_id,
-                session_id=session_id, filename=filename_base, version=version_to_load
-            )
-
-        if not image_artifact or not image_artifact.inline_data:
-            raise FileNotFoundError(f"Content for '{filename_base}' v{version_to_load} not found.")
+                output_filename = f"{filename_base}_resized"
 
-        image_bytes = image_artifact.inline_data.data
+        resize_geometry = _resize_geometry(width, height, percentage, maintain_aspect_ratio)
 
-        # Create temporary files
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename_base).suffix) as tmp_input:
-            tmp_input.write(image_bytes)
-            tmp_input_path = tmp_input.name
-
-        try:
-            if not output_filename:
-                name_parts = filename_base.rsplit(".", 1)
-                if len(name_parts) == 2:
-                    output_filename = f"{name_parts[0]}_resized.{name_parts[1]}"
-                else:
-                    output_filename = f"{filename_base}_resized"
-
-            tmp_output_path = tempfile.mktemp(suffix=Path(output_filename).suffix)
-
-            # Build resize geometry
-            if percentage:
-                resize_geometry = f"{percentage}%"
-            elif width and height:
-                if maintain_aspect_ratio:
-                    resize_geometry = f"{width}x{height}"
-                else:
-                    resize_geometry = f"{width}x{height}!"
-            elif width:
-                resize_geometry = f"{width}x"
-            else:  # height only
-                resize_geometry = f"x{height}"
-
-            # Run ImageMagick resize command
-            cmd = ["convert", tmp_input_path, "-resize", resize_geometry, tmp_output_path]
-
-            logger.debug(f"{log_identifier} Running command: {' '.join(cmd)}")
-            result = await asyncio.to_thread(
-                subprocess.run, cmd, capture_output=True, text=True, check=True
-            )
-
-            # Read output file
-            with open(tmp_output_path, "rb") as f:
-                output_bytes = f.read()
-
-            # Determine MIME type
-            suffix = Path(output_filename).suffix.lower()
-            mime_type_map = {
-                ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png",
-                ".gif": "image/gif", ".bmp": "image/bmp", ".webp": "image/webp",
-            }
-            mime_type = mime_type_map.get(suffix, "application/octet-stream")
-
-            # Save output artifact
-            timestamp = datetime.now(timezone.utc)
-            metadata_dict = {
-                "description": f"Resized image from {filename_base}",
-                "source_tool": "resize_image",
-                "source_filename": filename_base,
-                "source_version": version_to_load,
-                "resize_geometry": resize_geometry,
-                "creation_timestamp_iso": timestamp.isoformat(),
-            }
-
-            save_result = await save_artifact_with_metadata(
-                artifact_service=artifact_service,
-                app_name=app_name,
-                user_id=user_id,
-                session_id=session_id,
-                filename=output_filename,
-                content_bytes=output_bytes,
-                mime_type=mime_type,
-                metadata_dict=metadata_dict,
-                timestamp=timestamp,
-                schema_max_keys=DEFAULT_SCHEMA_MAX_KEYS,
-                tool_context=tool_context,
-            )
-
-            if save_result.get("status") == "error":
-                raise Exception(f"Failed to save artifact: {save_result.get('message')}")
+        async with _job_slot(tool_config):
+            if _use_wand(tool_config):
+                output_bytes = await asyncio.to_thread(
+                    _run_wand,
+                    image_bytes,
+                    _format_from_name(output_filename),
+                    functools.partial(_wand_resize, geometry=resize_geometry),
+                )
+            else:
+                output_bytes = await _run_convert(
+                    image_bytes,
+                    _sniff_format(image_bytes),
+                    _format_from_name(output_filename),
+                    ("-resize", resize_geometry),
+                    log_identifier,
+                )
 
-            logger.info(f"{log_identifier} Successfully resized image to {output_filename}")
-            return {
-                "status": "success",
-                "message": f"Image resized successfully using geometry {resize_geometry}",
-                "output_filename": output_filename,
-                "output_version": save_result["data_version"],
-                "resize_geometry": resize_geometry,
-            }
+        # Determine MIME type
+        suffix = Path(output_filename).suffix.lower()
+        mime_type = _MIME_TYPE_MAP.get(suffix, "application/octet-stream")
+
+        # Save output artifact
+        timestamp = datetime.now(timezone.utc)
+        metadata_dict = {
+            "description": f"Resized image from {filename_base}",
+            "source_tool": "resize_image",
+            "source_filename": filename_base,
+            "source_version": version_to_load,
+            "resize_geometry": resize_geometry,
+            "creation_timestamp_iso": timestamp.isoformat(),
+        }
 
-        finally:
-            if os.path.exists(tmp_input_path):
-                os.unlink(tmp_input_path)
-            if os.path.exists(tmp_output_path):
-                os.unlink(tmp_output_path)
+        save_result = await _save_output(
+            artifact_service,
+            app_name,
+            user_id,
+            session_id,
+            output_filename,
+            output_bytes,
+            mime_type,
+            metadata_dict,
+            timestamp,
+            tool_context,
+            tool_config,
+            log_identifier,
+        )
+
+        logger.info(f"{log_identifier} Successfully resized image to {output_filename}")
+        return {
+            "status": "success",
+            "message": f"Image resized successfully using geometry {resize_geometry}",
+            "output_filename": output_filename,
+            "output_version": save_result["data_version"],
+            "resize_geometry": resize_geometry,
+            **_pending_fields(save_result),
+        }
 
     except subprocess.CalledProcessError as e:
         logger.error(f"{log_identifier} ImageMagick command failed: {e.stderr}")
@@ -440,146 +1145,88 @@ async def convert_image_format(
         return {"status": "error", "message": "ToolContext is missing."}
 
     # Validate format
-    supported_formats = ["jpg", "jpeg", "png", "gif", "webp", "bmp"]
     output_format = output_format.lower()
-    if output_format not in supported_formats:
+    if output_format not in _SUPPORTED_FORMATS:
         return {
             "status": "error",
-            "message": f"Unsupported format '{output_format}'. Supported: {', '.join(supported_formats)}"
+            "message": f"Unsupported format '{output_format}'. Supported: {_SUPPORTED_FORMATS_TEXT}"
         }
 
     try:
-        # Extract invocation context (same pattern as above)
-        inv_context = tool_context._invocation_context
-        if not inv_context:
-            raise ValueError("InvocationContext is not available.")
-
-        app_name = getattr(inv_context, "app_name", None)
-        user_id = getattr(inv_context, "user_id", None)
-        session_id = get_original_session_id(inv_context)
-        artifact_service = getattr(inv_context, "artifact_service", None)
-
-        if not all([app_name, user_id, session_id, artifact_service]):
-            raise ValueError("Missing required context parts")
-
-        # Load image artifact
-        parts = image_filename.rsplit(":", 1)
-        filename_base = parts[0]
-        version_str = parts[1] if len(parts) > 1 else None
-        version_to_load = int(version_str) if version_str else None
-
-        if version_to_load is None:
-            list_versions_method = getattr(artifact_service, "list_versions")
-            if inspect.iscoroutinefunction(list_versions_method):
-                versions = await list_versions_method(
-                    app_name=app_name, user_id=user_id, session_id=session_id, filename=filename_base
-                )
-            else:
-                versions = await asyncio.to_thread(
-                    list_versions_method, app_name=app_name, user_id=user_id, session_id=session_id, filename=filename_base
-                )
-            if not versions:
-                raise FileNotFoundError(f"Image artifact '{filename_base}' not found.")
-            version_to_load = max(versions)
-
-        load_artifact_method = getattr(artifact_service, "load_artifact")
-        if inspect.iscoroutinefunction(load_artifact_method):
-            image_artifact = await load_artifact_method(
-                app_name=app_name, user_id=user_id, session_id=session_id,
-                filename=filename_base, version=version_to_load
-            )
-        else:
-            image_artifact = await asyncio.to_thread(
-                load_artifact_method, app_name=app_name, user_id=user_id,
-                session_id=session_id, filename=filename_base, version=version_to_load
-            )
-
-        if not image_artifact or not image_artifact.inline_data:
-            raise FileNotFoundError(f"Content for '{filename_base}' v{version_to_load} not found.")
-
-        image_bytes = image_artifact.inline_data.data
+        (
+            image_bytes, filename_base, version_to_load, app_name, user_id, session_id, artifact_service
+        ) = await _prepare(tool_context, image_filename)
 
-        # Create temporary files
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename_base).suffix) as tmp_input:
-            tmp_input.write(image_bytes)
-            tmp_input_path = tmp_input.name
-
-        try:
-            if not output_filename:
-                name_base = filename_base.rsplit(".", 1)[0]
-                output_filename = f"{name_base}.{output_format}"
+        if not output_filename:
+            name_base = filename_base.rsplit(".", 1)[0]
+            output_filename = f"{name_base}.{output_format}"
 
-            tmp_output_path = tempfile.mktemp(suffix=f".{output_format}")
+        # Quality only applies to JPEG output
+        jpeg_quality = quality if quality and output_format in _JPEG_FORMATS else None
 
-            # Build ImageMagick command
-            cmd = ["convert", tmp_input_path]
-
-            # Add quality parameter for JPEG
-            if quality and output_format in ["jpg", "jpeg"]:
-                cmd.extend(["-quality", str(quality)])
-
-            cmd.append(tmp_output_path)
-
-            logger.debug(f"{log_identifier} Running command: {' '.join(cmd)}")
-            result = await asyncio.to_thread(
-                subprocess.run, cmd, capture_output=True, text=True, check=True
-            )
-
-            # Read output file
-            with open(tmp_output_path, "rb") as f:
-                output_bytes = f.read()
-
-            # Determine MIME type
-            mime_type_map = {
-                "jpg": "image/jpeg", "jpeg": "image/jpeg", "png": "image/png",
-                "gif": "image/gif", "bmp": "image/bmp", "webp": "image/webp",
-            }
-            mime_type = mime_type_map.get(output_format, "application/octet-stream")
-
-            # Save output artifact
-            timestamp = datetime.now(timezone.utc)
-            metadata_dict = {
-                "description": f"Format converted image from {filename_base}",
-                "source_tool": "convert_image_format",
-                "source_filename": filename_base,
-                "source_version": version_to_load,
-                "output_format": output_format,
-                "creation_timestamp_iso": timestamp.isoformat(),
-            }
-            if quality:
-                metadata_dict["quality"] = quality
-
-            save_result = await save_artifact_with_metadata(
-                artifact_service=artifact_service,
-                app_name=app_name,
-                user_id=user_id,
-                session_id=session_id,
-                filename=output_filename,
-                content_bytes=output_bytes,
-                mime_type=mime_type,
-                metadata_dict=metadata_dict,
-                timestamp=timestamp,
-                schema_max_keys=DEFAULT_SCHEMA_MAX_KEYS,
-                tool_context=tool_context,
-            )
-
-            if save_result.get("status") == "error":
-                raise Exception(f"Failed to save artifact: {save_result.get('message')}")
-
-            logger.info(f"{log_identifier} Successfully converted image to {output_filename}")
-            return {
-                "status": "success",
-                "message": f"Image converted successfully to {output_format}",
-                "output_filename": output_filename,
-                "output_version": save_result["data_version"],
-                "output_format": output_format,
-            }
-
-        finally:
-            if os.path.exists(tmp_input_path):
-                os.unlink(tmp_input_path)
-            if os.path.exists(tmp_output_path):
-                os.unlink(tmp_output_path)
+        if jpeg_quality is None and _sniff_format(image_bytes) == _FORMAT_ALIASES.get(output_format, output_format):
+            # Already in the target format with nothing to change: re-save the original bytes
+            logger.debug(f"{log_identifier} Source is already {output_format}, skipping conversion")
+            output_bytes = image_bytes
+        else:
+            async with _job_slot(tool_config):
+                if _use_wand(tool_config):
+                    output_bytes = await asyncio.to_thread(
+                        _run_wand,
+                        image_bytes,
+                        output_format,
+                        functools.partial(_wand_quality, quality=jpeg_quality),
+                    )
+                else:
+                    args = ("-quality", str(jpeg_quality)) if jpeg_quality else ()
+                    output_bytes = await _run_convert(
+                        image_bytes,
+                        _sniff_format(image_bytes),
+                        output_format,
+                        args,
+                        log_identifier,
+                    )
+
+        # Determine MIME type
+        mime_type = _MIME_BY_FORMAT.get(output_format, "application/octet-stream")
+
+        # Save output artifact
+        timestamp = datetime.now(timezone.utc)
+        metadata_dict = {
+            "description": f"Format converted image from {filename_base}",
+            "source_tool": "convert_image_format",
+            "source_filename": filename_base,
+            "source_version": version_to_load,
+            "output_format": output_format,
+            "creation_timestamp_iso": timestamp.isoformat(),
+        }
+        if quality:
+            metadata_dict["quality"] = quality
+
+        save_result = await _save_output(
+            artifact_service,
+            app_name,
+            user_id,
+            session_id,
+            output_filename,
+            output_bytes,
+            mime_type,
+            metadata_dict,
+            timestamp,
+            tool_context,
+            tool_config,
+            log_identifier,
+        )
+
+        logger.info(f"{log_identifier} Successfully converted image to {output_filename}")
+        return {
+            "status": "success",
+            "message": f"Image converted successfully to {output_format}",
+            "output_filename": output_filename,
+            "output_version": save_result["data_version"],
+            "output_format": output_format,
+            **_pending_fields(save_result),
+        }
 
     except subprocess.CalledProcessError as e:
         logger.error(f"{log_identifier} ImageMagick command failed: {e.stderr}")
@@ -628,167 +1275,250 @@ async def add_text_overlay(
         return {"status": "error", "message": "ToolContext is missing."}
 
     # Validate position
-    valid_positions = ["north", "south", "east", "west", "center", "northeast", "northwest", "southeast", "southwest"]
     position = position.lower()
-    if position not in valid_positions:
+    if position not in _VALID_POSITIONS:
         return {
             "status": "error",
-            "message": f"Invalid position '{position}'. Valid: {', '.join(valid_positions)}"
+            "message": f"Invalid position '{position}'. Valid: {_VALID_POSITIONS_TEXT}"
         }
 
     try:
-        # Extract invocation context
-        inv_context = tool_context._invocation_context
-        if not inv_context:
-            raise ValueError("InvocationContext is not available.")
-
-        app_name = getattr(inv_context, "app_name", None)
-        user_id = getattr(inv_context, "user_id", None)
-        session_id = get_original_session_id(inv_context)
-        artifact_service = getattr(inv_context, "artifact_service", None)
-
-        if not all([app_name, user_id, session_id, artifact_service]):
-            raise ValueError("Missing required context parts")
-
-        # Load image artifact
-        parts = image_filename.rsplit(":", 1)
-        filename_base = parts[0]
-        version_str = parts[1] if len(parts) > 1 else None
-        version_to_load = int(version_str) if version_str else None
-
-        if version_to_load is None:
-            list_versions_method = getattr(artifact_service, "list_versions")
-            if inspect.iscoroutinefunction(list_versions_method):
-                versions = await list_versions_method(
-                    app_name=app_name, user_id=user_id, session_id=session_id, filename=filename_base
+        (
+            image_bytes, filename_base, version_to_load, app_name, user_id, session_id, artifact_service
+        ) = await _prepare(tool_context, image_filename)
+
+        if not output_filename:
+            name_parts = filename_base.rsplit(".", 1)
+            if len(name_parts) == 2:
+                output_filename = f"{name_parts[0]}_text.{name_parts[1]}"
+            else:
+                output_filename = f"{filename_base}_text"
+
+        async with _job_slot(tool_config):
+            if _use_wand(tool_config):
+                output_bytes = await asyncio.to_thread(
+                    _run_wand,
+                    image_bytes,
+                    _format_from_name(output_filename),
+                    functools.partial(
+                        _wand_annotate,
+                        text=text,
+                        position=position,
+                        font_size=font_size,
+                        font_color=font_color,
+                        background_color=background_color,
+                    ),
                 )
             else:
-                versions = await asyncio.to_thread(
-                    list_versions_method, app_name=app_name, user_id=user_id, session_id=session_id, filename=filename_base
+                output_bytes = await _run_convert(
+                    image_bytes,
+                    _sniff_format(image_bytes),
+                    _format_from_name(output_filename),
+                    _annotate_args(text, position, font_size, font_color, background_color),
+                    log_identifier,
                 )
-            if not versions:
-                raise FileNotFoundError(f"Image artifact '{filename_base}' not found.")
-            version_to_load = max(versions)
-
-        load_artifact_method = getattr(artifact_service, "load_artifact")
-        if inspect.iscoroutinefunction(load_artifact_method):
-            image_artifact = await load_artifact_method(
-                app_name=app_name, user_id=user_id, session_id=session_id,
-                filename=filename_base, version=version_to_load
-            )
-        else:
-            image_artifact = await asyncio.to_thread(
-                load_artifact_method, app_name=app_name, user_id=user_id,
-                session_id=session_id, filename=filename_base, version=version_to_load
-            )
 
-        if not image_artifact or not image_artifact.inline_data:
-            raise FileNotFoundError(f"Content for '{filename_base}' v{version_to_load} not found.")
+        # Determine MIME type
+        suffix = Path(output_filename).suffix.lower()
+        mime_type = _MIME_TYPE_MAP.get(suffix, "application/octet-stream")
+
+        # Save output artifact
+        timestamp = datetime.now(timezone.utc)
+        metadata_dict = {
+            "description": f"Text overlay added to {filename_base}",
+            "source_tool": "add_text_overlay",
+            "source_filename": filename_base,
+            "source_version": version_to_load,
+            "overlay_text": text,
+            "text_position": position,
+            "font_size": font_size,
+            "font_color": font_color,
+            "creation_timestamp_iso": timestamp.isoformat(),
+        }
+        if background_color:
+            metadata_dict["background_color"] = background_color
+
+        save_result = await _save_output(
+            artifact_service,
+            app_name,
+            user_id,
+            session_id,
+            output_filename,
+            output_bytes,
+            mime_type,
+            metadata_dict,
+            timestamp,
+            tool_context,
+            tool_config,
+            log_identifier,
+        )
+
+        logger.info(f"{log_identifier} Successfully added text overlay to {output_filename}")
+        return {
+            "status": "success",
+            "message": f"Text overlay added successfully",
+            "output_filename": output_filename,
+            "output_version": save_result["data_version"],
+            "text": text,
+            "position": position,
+            **_pending_fields(save_result),
+        }
 
-        image_bytes = image_artifact.inline_data.data
+    except subprocess.CalledProcessError as e:
+        logger.error(f"{log_identifier} ImageMagick command failed: {e.stderr}")
+        return {"status": "error", "message": f"ImageMagick error: {e.stderr}"}
+    except FileNotFoundError as e:
+        logger.warning(f"{log_identifier} File not found: {e}")
+        return {"status": "error", "message": str(e)}
+    except Exception as e:
+        logger.exception(f"{log_identifier} Unexpected error: {e}")
+        return {"status": "error", "message": f"An unexpected error occurred: {e}"}
 
-        # Create temporary files
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename_base).suffix) as tmp_input:
-            tmp_input.write(image_bytes)
-            tmp_input_path = tmp_input.name
 
-        try:
-            if not output_filename:
-                name_parts = filename_base.rsplit(".", 1)
-                if len(name_parts) == 2:
-                    output_filename = f"{name_parts[0]}_text.{name_parts[1]}"
-                else:
-                    output_filename = f"{filename_base}_text"
-
-            tmp_output_path = tempfile.mktemp(suffix=Path(output_filename).suffix)
-
-            # Build ImageMagick command
-            cmd = ["convert", tmp_input_path]
-
-            # Add background color if specified
-            if background_color:
-                cmd.extend([
-                    "-background", background_color,
-                    "-fill", font_color,
-                    "-pointsize", str(font_size),
-                    "-gravity", position,
-                    "-annotate", "+0+0", text
-                ])
-            else:
-                cmd.extend([
-                    "-fill", font_color,
-                    "-pointsize", str(font_size),
-                    "-gravity", position,
-                    "-annotate", "+0+0", text
-                ])
-
-            cmd.append(tmp_output_path)
-
-            logger.debug(f"{log_identifier} Running command: {' '.join(cmd)}")
-            result = await asyncio.to_thread(
-                subprocess.run, cmd, capture_output=True, text=True, check=True
-            )
+async def transform_image(
+    image_filename: str,
+    operations: List[Dict[str, Any]],
+    output_format: Optional[str] = None,
+    quality: Optional[int] = None,
+    output_filename: Optional[str] = None,
+    tool_context: Optional[ToolContext] = None,
+    tool_config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Apply several operations to an image in one ImageMagick pass.
 
-            # Read output file
-            with open(tmp_output_path, "rb") as f:
-                output_bytes = f.read()
+    The image is decoded once, each operation is applied in order, and the result is
+    encoded once, so chaining crop, resize, and text this way is faster and loses less
+    quality than calling the individual tools one after another.
 
-            # Determine MIME type
-            suffix = Path(output_filename).suffix.lower()
-            mime_type_map = {
-                ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png",
-                ".gif": "image/gif", ".bmp": "image/bmp", ".webp": "image/webp",
-            }
-            mime_type = mime_type_map.get(suffix, "application/octet-stream")
-
-            # Save output artifact
-            timestamp = datetime.now(timezone.utc)
-            metadata_dict = {
-                "description": f"Text overlay added to {filename_base}",
-                "source_tool": "add_text_overlay",
-                "source_filename": filename_base,
-                "source_version": version_to_load,
-                "overlay_text": text,
-                "text_position": position,
-                "font_size": font_size,
-                "font_color": font_color,
-                "creation_timestamp_iso": timestamp.isoformat(),
-            }
-            if background_color:
-                metadata_dict["background_color"] = background_color
-
-            save_result = await save_artifact_with_metadata(
-                artifact_service=artifact_service,
-                app_name=app_name,
-                user_id=user_id,
-                session_id=session_id,
-                filename=output_filename,
-                content_bytes=output_bytes,
-                mime_type=mime_type,
-                metadata_dict=metadata_dict,
-                timestamp=timestamp,
-                schema_max_keys=DEFAULT_SCHEMA_MAX_KEYS,
-                tool_context=tool_context,
-            )
+    Args:
+        image_filename: Input image filename with optional version
+        operations: Operations to apply in order. Each is a dict with an "op" key:
+            {"op": "crop", "width": 800, "height": 600, "x_offset": 0, "y_offset": 0},
+            {"op": "resize", "percentage": 50} or {"op": "resize", "width": 800, "height": 600,
+            "maintain_aspect_ratio": true}, or {"op": "text", "text": "Hello", "position": "south",
+            "font_size": 32, "font_color": "white", "background_color": "black"}
+        output_format: Optional target format (jpg, jpeg, png, gif, webp, bmp)
+        quality: JPEG quality 1-100 (only for JPEG output)
+        output_filename: Optional output filename (default: adds "_transformed" suffix)
+        tool_context: Framework context for accessing artifact service
+        tool_config: Optional configuration
 
-            if save_result.get("status") == "error":
-                raise Exception(f"Failed to save artifact: {save_result.get('message')}")
+    Returns:
+        Dictionary with status, message, and output file information
+    """
+    log_identifier = f"[ImageMagick:transform_image:{image_filename}]"
+    logger.info(f"{log_identifier} Applying {len(operations or [])} operations")
 
-            logger.info(f"{log_identifier} Successfully added text overlay to {output_filename}")
+    if not tool_context:
+        logger.error(f"{log_identifier} ToolContext is missing.")
+        return {"status": "error", "message": "ToolContext is missing."}
+
+    if not operations:
+        return {"status": "error", "message": "Must specify at least one operation"}
+
+    if output_format:
+        output_format = output_format.lower()
+        if output_format not in _SUPPORTED_FORMATS:
             return {
-                "status": "success",
-                "message": f"Text overlay added successfully",
-                "output_filename": output_filename,
-                "output_version": save_result["data_version"],
-                "text": text,
-                "position": position,
+                "status": "error",
+                "message": f"Unsupported format '{output_format}'. Supported: {_SUPPORTED_FORMATS_TEXT}"
             }
 
-        finally:
-            if os.path.exists(tmp_input_path):
-                os.unlink(tmp_input_path)
-            if os.path.exists(tmp_output_path):
-                os.unlink(tmp_output_path)
+    # Validate every operation before loading anything
+    args: List[str] = []
+    wand_steps: List[Callable[[Any], None]] = []
+    descriptions: List[str] = []
+    for index, operation in enumerate(operations):
+        try:
+            op_args, wand_step, description = _compile_operation(operation)
+        except (AttributeError, TypeError, ValueError) as e:
+            return {"status": "error", "message": f"Invalid operation {index}: {e}"}
+        args.extend(op_args)
+        wand_steps.append(wand_step)
+        descriptions.append(description)
+
+    try:
+        (
+            image_bytes, filename_base, version_to_load, app_name, user_id, session_id, artifact_service
+        ) = await _prepare(tool_context, image_filename)
+
+        if not output_filename:
+            name_parts = filename_base.rsplit(".", 1)
+            extension = output_format or (name_parts[1] if len(name_parts) == 2 else None)
+            if extension:
+                output_filename = f"{name_parts[0]}_transformed.{extension}"
+            else:
+                output_filename = f"{filename_base}_transformed"
+
+        target_format = output_format or _format_from_name(output_filename)
+
+        # Quality only applies to JPEG output
+        jpeg_quality = quality if quality and target_format in _JPEG_FORMATS else None
+
+        async with _job_slot(tool_config):
+            if _use_wand(tool_config):
+                wand_steps.append(functools.partial(_wand_quality, quality=jpeg_quality))
+                output_bytes = await asyncio.to_thread(
+                    _run_wand,
+                    image_bytes,
+                    target_format,
+                    functools.partial(_wand_chain, operations=wand_steps),
+                )
+            else:
+                if jpeg_quality:
+                    args.extend(["-quality", str(jpeg_quality)])
+                output_bytes = await _run_convert(
+                    image_bytes,
+                    _sniff_format(image_bytes),
+                    target_format,
+                    args,
+                    log_identifier,
+                )
+
+        # Determine MIME type
+        suffix = Path(output_filename).suffix.lower()
+        mime_type = _MIME_TYPE_MAP.get(suffix, "application/octet-stream")
+
+        # Save output artifact
+        timestamp = datetime.now(timezone.utc)
+        metadata_dict = {
+            "description": f"Transformed image from {filename_base}",
+            "source_tool": "transform_image",
+            "source_filename": filename_base,
+            "source_version": version_to_load,
+            "operations": "; ".join(descriptions),
+            "creation_timestamp_iso": timestamp.isoformat(),
+        }
+        if target_format:
+            metadata_dict["output_format"] = target_format
+        if jpeg_quality:
+            metadata_dict["quality"] = jpeg_quality
+
+        save_result = await _save_output(
+            artifact_service,
+            app_name,
+            user_id,
+            session_id,
+            output_filename,
+            output_bytes,
+            mime_type,
+            metadata_dict,
+            timestamp,
+            tool_context,
+            tool_config,
+            log_identifier,
+        )
+
+        logger.info(f"{log_identifier} Successfully transformed image to {output_filename}")
+        return {
+            "status": "success",
+            "message": f"Image transformed successfully: {'; '.join(descriptions)}",
+            "output_filename": output_filename,
+            "output_version": save_result["data_version"],
+            "operations": descriptions,
+            **_pending_fields(save_result),
+        }
 
     except subprocess.CalledProcessError as e:
         logger.error(f"{log_identifier} ImageMagick command failed: {e.stderr}")
@@ -803,6 +1533,7 @@ async def add_text_overlay(
 
 async def get_image_info(
     image_filename: str,
+    dimensions_only: bool = False,
     tool_context: Optional[ToolContext] = None,
     tool_config: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
@@ -814,6 +1545,8 @@ async def get_image_info(
 
     Args:
         image_filename: Input image filename with optional version (e.g., "photo.jpg" or "photo.jpg:2")
+        dimensions_only: Only return format, dimensions, and file size, read straight from the
+            image header without running ImageMagick (default: False)
         tool_context: Framework context for accessing artifact service
         tool_config: Optional configuration
 
@@ -828,128 +1561,77 @@ async def get_image_info(
         return {"status": "error", "message": "ToolContext is missing."}
 
     try:
-        # Extract invocation context
-        inv_context = tool_context._invocation_context
-        if not inv_context:
-            raise ValueError("InvocationContext is not available.")
-
-        app_name = getattr(inv_context, "app_name", None)
-        user_id = getattr(inv_context, "user_id", None)
-        session_id = get_original_session_id(inv_context)
-        artifact_service = getattr(inv_context, "artifact_service", None)
-
-        if not all([app_name, user_id, session_id, artifact_service]):
-            raise ValueError("Missing required context parts")
-
-        # Parse input filename and version
-        parts = image_filename.rsplit(":", 1)
-        filename_base = parts[0]
-        version_str = parts[1] if len(parts) > 1 else None
-        version_to_load = int(version_str) if version_str else None
-
-        # Get latest version if not specified
-        if version_to_load is None:
-            list_versions_method = getattr(artifact_service, "list_versions")
-            if inspect.iscoroutinefunction(list_versions_method):
-                versions = await list_versions_method(
-                    app_name=app_name, user_id=user_id, session_id=session_id, filename=filename_base
-                )
-            else:
-                versions = await asyncio.to_thread(
-                    list_versions_method, app_name=app_name, user_id=user_id,
-                    session_id=session_id, filename=filename_base
-                )
-            if not versions:
-                raise FileNotFoundError(f"Image artifact '{filename_base}' not found.")
-            version_to_load = max(versions)
-
-        # Load image artifact
-        load_artifact_method = getattr(artifact_service, "load_artifact")
-        if inspect.iscoroutinefunction(load_artifact_method):
-            image_artifact = await load_artifact_method(
-                app_name=app_name, user_id=user_id, session_id=session_id,
-                filename=filename_base, version=version_to_load
-            )
+        (
+            filename_base, version_to_load, app_name, user_id, session_id, artifact_service
+        ) = await _resolve_target(tool_context, image_filename)
+
+        # Artifact versions are immutable, so a version already inspected needs no reload
+        info_key = (app_name, user_id, session_id, filename_base, version_to_load)
+        cached = _IMAGE_INFO_CACHE.get(info_key)
+        if cached is not None:
+            _IMAGE_INFO_CACHE.move_to_end(info_key)
+            info, file_size_bytes = cached
         else:
-            image_artifact = await asyncio.to_thread(
-                load_artifact_method, app_name=app_name, user_id=user_id,
-                session_id=session_id, filename=filename_base, version=version_to_load
+            image_bytes = await _load_image_bytes(
+                artifact_service, app_name, user_id, session_id, filename_base, version_to_load
             )
 
-        if not image_artifact or not image_artifact.inline_data:
-            raise FileNotFoundError(f"Content for '{filename_base}' v{version_to_load} not found.")
-
-        image_bytes = image_artifact.inline_data.data
-
-        # Create temporary file for the image
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename_base).suffix) as tmp_input:
-            tmp_input.write(image_bytes)
-            tmp_input_path = tmp_input.name
-
-        try:
-            # Run ImageMagick identify command with detailed format
-            cmd = [
-                "identify",
-                "-format",
-                "%w|%h|%m|%b|%[colorspace]|%z|%C|%Q",
-                tmp_input_path
-            ]
-
-            logger.debug(f"{log_identifier} Running command: {' '.join(cmd)}")
-            result = await asyncio.to_thread(
-                subprocess.run,
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-
-            # Parse the output
-            # Format: width|height|format|filesize|colorspace|depth|compression|quality
-            output = result.stdout.strip()
-            parts_output = output.split('|')
-
-            if len(parts_output) >= 7:
-                width = int(parts_output[0])
-                height = int(parts_output[1])
-                image_format = parts_output[2]
-                file_size = parts_output[3]
-                colorspace = parts_output[4]
-                bit_depth = int(parts_output[5]) if parts_output[5].isdigit() else None
-                compression = parts_output[6]
-                quality = int(parts_output[7]) if len(parts_output) > 7 and parts_output[7].isdigit() else None
-
-                logger.info(f"{log_identifier} Image info retrieved: {width}x{height} {image_format}")
-
-                result_dict = {
+            probed = _probe_dimensions(image_bytes) if dimensions_only else None
+            if probed is not None:
+                width, height, image_format = probed
+                logger.info(f"{log_identifier} Image dimensions read from header: {width}x{height}")
+                return {
                     "status": "success",
-                    "message": "Image information retrieved successfully",
+                    "message": "Image dimensions retrieved successfully",
                     "filename": filename_base,
                     "version": version_to_load,
-                    "format": image_format,
+                    "format": image_format.upper(),
                     "dimensions": {
                         "width": width,
                         "height": height
                     },
-                    "file_size": file_size,
                     "file_size_bytes": len(image_bytes),
-                    "colorspace": colorspace,
-                    "compression": compression,
                 }
 
-                if bit_depth is not None:
-                    result_dict["bit_depth"] = bit_depth
-                if quality is not None:
-                    result_dict["quality"] = quality
+            async with _job_slot(tool_config):
+                if _use_wand(tool_config):
+                    info = await asyncio.to_thread(_wand_identify, image_bytes)
+                else:
+                    # -ping reads only what the header describes; none of the fields need decoded pixels
+                    cmd = (
+                        "identify", "-ping", "-format", _IDENTIFY_FORMAT, _pipe_spec(_sniff_format(image_bytes))
+                    )
+                    stdout = await _run_command(cmd, image_bytes, log_identifier)
+                    info = _parse_identify(stdout.decode("utf-8", errors="replace").strip())
+            file_size_bytes = len(image_bytes)
+            _remember_image_info(info_key, info, file_size_bytes)
+
+        width, height, image_format, file_size, colorspace, bit_depth, compression, quality = info
+
+        logger.info(f"{log_identifier} Image info retrieved: {width}x{height} {image_format}")
+
+        result_dict = {
+            "status": "success",
+            "message": "Image information retrieved successfully",
+            "filename": filename_base,
+            "version": version_to_load,
+            "format": image_format,
+            "dimensions": {
+                "width": width,
+                "height": height
+            },
+            "file_size": file_size,
+            "file_size_bytes": file_size_bytes,
+            "colorspace": colorspace,
+            "compression": compression,
+        }
 
-                return result_dict
-            else:
-                raise Exception(f"Unexpected identify output format: {output}")
+        if bit_depth is not None:
+            result_dict["bit_depth"] = bit_depth
+        if quality is not None:
+            result_dict["quality"] = quality
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_input_path):
-                os.unlink(tmp_input_path)
+        return result_dict
 
     except subprocess.CalledProcessError as e:
         logger.error(f"{log_identifier} ImageMagick identify command failed: {e.stderr}")
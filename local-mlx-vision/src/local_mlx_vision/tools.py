@@ -1,12 +1,14 @@
 import logging
 import asyncio
-import subprocess
+import concurrent.futures
+import functools
 import tempfile
 import platform
 import os
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple, Union
 
 from google.adk.tools import ToolContext
 from solace_agent_mesh.agent.utils.artifact_helpers import (
@@ -19,11 +21,104 @@ log = logging.getLogger(__name__)
 
 PLUGIN_NAME = "local-mlx-vision"
 
+DEFAULT_MODEL = "mlx-community/Qwen3-VL-2B-Instruct-4bit"
+GENERATION_TIMEOUT_SECONDS = 300
 
+# Where the mlx_vlm.generate fallback stages artifacts: a RAM-backed directory when one
+# is available (e.g. a RAM disk on macOS, set via LOCAL_MLX_VISION_TMPDIR), otherwise
+# the system temp directory.
+_TMP_DIR = os.environ.get("LOCAL_MLX_VISION_TMPDIR") or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+# Models run in-process and stay loaded between calls, instead of a fresh
+# `python -m mlx_vlm.generate` reloading the weights every time. MLX inference is not
+# thread-safe, so all loading and generation happens on this single long-lived thread.
+_MLX_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="mlx-vlm")
+
+# model name -> (model, processor, config)
+_MODEL_CACHE: Dict[str, Tuple[Any, Any, Any]] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_mlx_vlm():
+    """Import mlx-vlm on first use; returns (load, generate, load_config, load_image, apply_chat_template) or None."""
+    try:
+        from mlx_vlm import load, generate
+        from mlx_vlm.prompt_utils import apply_chat_template
+        from mlx_vlm.utils import load_config, load_image
+    except ImportError as e:
+        log.info(f"[{PLUGIN_NAME}] mlx-vlm not importable in-process, using the mlx_vlm.generate CLI: {e}")
+        return None
+    return load, generate, load_config, load_image, apply_chat_template
+
+
+def _use_in_process(tool_config: Dict[str, Any]) -> bool:
+    return tool_config.get("in_process", True) and _get_mlx_vlm() is not None
+
+
+def _generate_in_process(
+    model_name: str,
+    prompt: str,
+    image: Union[str, bytes],
+    system_message: Optional[str],
+    max_tokens: int,
+    temperature: float,
+) -> str:
+    """
+    Run one generation with a cached model. Blocking; run it on _MLX_EXECUTOR.
+
+    Args:
+        model_name: Hugging Face model id or local path
+        prompt: The question or instruction for the vision model
+        image: Path of the image to analyze, or its encoded bytes
+        system_message: Optional system message to guide the model's behavior
+        max_tokens: Maximum number of tokens to generate
+        temperature: Sampling temperature
+
+    Returns:
+        The generated text
+    """
+    load, generate, load_config, load_image, apply_chat_template = _get_mlx_vlm()
+
+    if model_name not in _MODEL_CACHE:
+        log.info(f"[{PLUGIN_NAME}] Loading model {model_name}")
+        model, processor = load(model_name)
+        _MODEL_CACHE[model_name] = (model, processor, load_config(model_name))
+    model, processor, config = _MODEL_CACHE[model_name]
+
+    if system_message:
+        messages = [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt},
+        ]
+    else:
+        messages = prompt
+    formatted_prompt = apply_chat_template(processor, config, messages, num_images=1)
+
+    if isinstance(image, bytes):
+        # Decode artifact bytes the same way mlx-vlm loads an image file
+        image = load_image(BytesIO(image))
+
+    result = generate(
+        model,
+        processor,
+        formatted_prompt,
+        image=[image],
+        max_tokens=max_tokens,
+        temperature=temperature,
+        verbose=False,
+    )
+    # Older mlx-vlm releases return the text itself, newer ones a GenerationResult
+    return getattr(result, "text", result)
+
+
+@functools.lru_cache(maxsize=1)
 def validate_apple_silicon() -> Dict[str, Any]:
     """
     Validate that the current platform is macOS with Apple Silicon.
 
+    The platform cannot change while the process runs, so the check and its log
+    message happen once; later calls return the same result.
+
     Returns:
         Dict containing validation status and error message if applicable.
     """
@@ -51,6 +146,47 @@ def validate_apple_silicon() -> Dict[str, Any]:
     return {"valid": True}
 
 
+def _extract_tuple(artifact_part: tuple) -> Optional[Any]:
+    # Tuple - recursively extract from first element
+    return _extract_artifact_data(artifact_part[0]) if artifact_part else None
+
+
+# Return types that are recognised by type alone, before probing for Part attributes
+_EXTRACTORS = (
+    (bytes, lambda artifact_part: artifact_part),
+    (tuple, _extract_tuple),
+)
+
+
+def _extract_artifact_data(artifact_part: Any) -> Optional[Any]:
+    """
+    Extract the content from whatever the artifact service's load_artifact returned.
+
+    The artifact service can return different types depending on version:
+    - Direct bytes
+    - Tuple with Part as first element
+    - Part with inline_data.data (Google A2A format)
+    - Part with file.bytes (A2A FilePart format)
+    - SamFilePart with content_bytes, or an object with a direct data attribute
+
+    Returns:
+        The extracted content, or None if nothing was found
+    """
+    for part_type, extractor in _EXTRACTORS:
+        if isinstance(artifact_part, part_type):
+            return extractor(artifact_part)
+
+    inline_data = getattr(artifact_part, "inline_data", None)
+    if inline_data is not None:
+        return getattr(inline_data, "data", getattr(inline_data, "blob", None))
+
+    file = getattr(artifact_part, "file", None)
+    if file is not None:
+        return getattr(file, "bytes", getattr(file, "content_bytes", None))
+
+    return getattr(artifact_part, "content_bytes", getattr(artifact_part, "data", None))
+
+
 async def analyze_image(
     prompt: str,
     image_path: Optional[str] = None,
@@ -113,8 +249,14 @@ async def analyze_image(
             "message": "Please provide either image_path or image_artifact parameter."
         }
 
+    # Get model from config (default to Qwen3-VL-2B-Instruct-4bit)
+    current_tool_config = tool_config if tool_config is not None else {}
+    model = current_tool_config.get("model", DEFAULT_MODEL)
+    in_process = _use_in_process(current_tool_config)
+
     # Handle artifact if provided
     temp_file_path = None
+    actual_image_path = None
     image_source_info = {}
 
     if image_artifact:
@@ -176,46 +318,8 @@ async def analyze_image(
                     "error": error_msg
                 }
 
-            # Extract bytes from artifact - handle different return types
-            # The artifact service can return different types depending on version:
-            # - Part with inline_data.data (Google A2A format)
-            # - Part with file.bytes (A2A FilePart format)
-            # - Direct bytes
-            # - Tuple with Part as first element
-            artifact_data = None
-
-            log.debug(f"{log_identifier} Artifact part type: {type(artifact_part)}, attrs: {dir(artifact_part) if artifact_part else 'None'}")
-
-            if isinstance(artifact_part, bytes):
-                # Direct bytes
-                artifact_data = artifact_part
-            elif hasattr(artifact_part, 'inline_data') and artifact_part.inline_data is not None:
-                # Part object with inline_data (Google format)
-                if hasattr(artifact_part.inline_data, 'data'):
-                    artifact_data = artifact_part.inline_data.data
-                elif hasattr(artifact_part.inline_data, 'blob'):
-                    artifact_data = artifact_part.inline_data.blob
-            elif hasattr(artifact_part, 'file') and artifact_part.file is not None:
-                # A2A FilePart format
-                if hasattr(artifact_part.file, 'bytes'):
-                    artifact_data = artifact_part.file.bytes
-                elif hasattr(artifact_part.file, 'content_bytes'):
-                    artifact_data = artifact_part.file.content_bytes
-            elif hasattr(artifact_part, 'content_bytes'):
-                # SamFilePart format
-                artifact_data = artifact_part.content_bytes
-            elif hasattr(artifact_part, 'data'):
-                # Object with direct data attribute
-                artifact_data = artifact_part.data
-            elif isinstance(artifact_part, tuple) and len(artifact_part) >= 1:
-                # Tuple - recursively extract from first element
-                first_elem = artifact_part[0]
-                if isinstance(first_elem, bytes):
-                    artifact_data = first_elem
-                elif hasattr(first_elem, 'inline_data') and first_elem.inline_data and hasattr(first_elem.inline_data, 'data'):
-                    artifact_data = first_elem.inline_data.data
-                elif hasattr(first_elem, 'file') and first_elem.file and hasattr(first_elem.file, 'bytes'):
-                    artifact_data = first_elem.file.bytes
+            log.debug(f"{log_identifier} Artifact part type: {type(artifact_part)}")
+            artifact_data = _extract_artifact_data(artifact_part)
 
             if artifact_data is None:
                 error_msg = f"Could not extract data from artifact. Type: {type(artifact_part)}"
@@ -241,20 +345,25 @@ async def analyze_image(
 
             log.debug(f"{log_identifier} Extracted {len(artifact_data)} bytes from artifact")
 
-            # Save artifact to temporary file
-            suffix = Path(artifact_filename).suffix or ".png"
-            with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix=suffix) as tmp_file:
-                tmp_file.write(artifact_data)
-                temp_file_path = tmp_file.name
-
-            actual_image_path = temp_file_path
             image_source_info = {
                 "source": "artifact",
                 "artifact_name": artifact_filename,
                 "artifact_version": artifact_version,
-                "temp_path": temp_file_path
             }
-            log.info(f"{log_identifier} Loaded artifact to temporary file: {temp_file_path}")
+
+            if in_process:
+                # The in-process model decodes the bytes directly; no temporary file needed
+                image_input = artifact_data
+            else:
+                # Save artifact to temporary file for the mlx_vlm.generate CLI
+                suffix = Path(artifact_filename).suffix or ".png"
+                with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix=suffix, dir=_TMP_DIR) as tmp_file:
+                    tmp_file.write(artifact_data)
+                    temp_file_path = tmp_file.name
+
+                actual_image_path = image_input = temp_file_path
+                image_source_info["temp_path"] = temp_file_path
+                log.info(f"{log_identifier} Loaded artifact to temporary file: {temp_file_path}")
 
         except Exception as e:
             error_msg = f"Failed to load artifact: {str(e)}"
@@ -266,7 +375,7 @@ async def analyze_image(
             }
     else:
         # Use provided file path
-        actual_image_path = image_path
+        actual_image_path = image_input = image_path
         image_source_info = {
             "source": "file_path",
             "path": image_path
@@ -274,7 +383,7 @@ async def analyze_image(
         log.info(f"{log_identifier} Using direct file path: {image_path}")
 
     # Verify image file exists
-    if not os.path.exists(actual_image_path):
+    if actual_image_path and not os.path.exists(actual_image_path):
         error_msg = f"Image file not found: {actual_image_path}"
         log.error(f"{log_identifier} {error_msg}")
         # Clean up temp file if we created one
@@ -286,53 +395,66 @@ async def analyze_image(
             "message": "The specified image file does not exist."
         }
 
-    # Get model from config (default to Qwen3-VL-2B-Instruct-4bit)
-    current_tool_config = tool_config if tool_config is not None else {}
-    model = current_tool_config.get("model", "mlx-community/Qwen3-VL-2B-Instruct-4bit")
-
-    # Build the mlx-vlm command
-    cmd = [
-        "python", "-m", "mlx_vlm.generate",
-        "--model", model,
-        "--max-tokens", str(max_tokens),
-        "--temperature", str(temperature),
-        "--prompt", prompt,
-        "--image", actual_image_path
-    ]
-
-    # Add system message if provided
-    if system_message:
-        cmd.extend(["--system", system_message])
-
-    log.info(f"{log_identifier} Executing mlx-vlm command: {' '.join(cmd)}")
-
     try:
-        # Run the command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-
-        # Clean up temp file if we created one
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
-            log.info(f"{log_identifier} Cleaned up temporary file: {temp_file_path}")
-
-        if result.returncode != 0:
-            error_msg = f"mlx-vlm command failed with exit code {result.returncode}"
-            log.error(f"{log_identifier} {error_msg}")
-            log.error(f"{log_identifier} stderr: {result.stderr}")
-            return {
-                "status": "error",
-                "error": error_msg,
-                "stderr": result.stderr,
-                "message": "Vision model execution failed."
-            }
+        if in_process:
+            log.info(f"{log_identifier} Running {model} in-process")
+            loop = asyncio.get_running_loop()
+            # On timeout the generation still finishes on the worker thread; only the wait is abandoned
+            output = await asyncio.wait_for(
+                loop.run_in_executor(
+                    _MLX_EXECUTOR,
+                    functools.partial(
+                        _generate_in_process,
+                        model, prompt, image_input, system_message, max_tokens, temperature,
+                    ),
+                ),
+                timeout=GENERATION_TIMEOUT_SECONDS,
+            )
+        else:
+            # Build the mlx-vlm command
+            cmd = [
+                "python", "-m", "mlx_vlm.generate",
+                "--model", model,
+                "--max-tokens", str(max_tokens),
+                "--temperature", str(temperature),
+                "--prompt", prompt,
+                "--image", actual_image_path
+            ]
+
+            # Add system message if provided
+            if system_message:
+                cmd.extend(["--system", system_message])
+
+            log.info(f"{log_identifier} Executing mlx-vlm command: {' '.join(cmd)}")
+
+            # Run the command without blocking the event loop
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=GENERATION_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
+
+            if proc.returncode != 0:
+                stderr_text = stderr.decode("utf-8", errors="replace")
+                error_msg = f"mlx-vlm command failed with exit code {proc.returncode}"
+                log.error(f"{log_identifier} {error_msg}")
+                log.error(f"{log_identifier} stderr: {stderr_text}")
+                return {
+                    "status": "error",
+                    "error": error_msg,
+                    "stderr": stderr_text,
+                    "message": "Vision model execution failed."
+                }
+            output = stdout.decode("utf-8", errors="replace")
 
         # Parse the output
-        output = result.stdout.strip()
+        output = output.strip()
         log.info(f"{log_identifier} Successfully received model response ({len(output)} characters)")
 
         return {
@@ -347,12 +469,9 @@ async def analyze_image(
             "message": "Image analyzed successfully."
         }
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         error_msg = "mlx-vlm command timed out after 5 minutes"
         log.error(f"{log_identifier} {error_msg}")
-        # Clean up temp file if we created one
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
         return {
             "status": "error",
             "error": error_msg,
@@ -361,14 +480,16 @@ async def analyze_image(
     except Exception as e:
         error_msg = f"Unexpected error during image analysis: {str(e)}"
         log.exception(f"{log_identifier} {error_msg}")
-        # Clean up temp file if we created one
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
         return {
             "status": "error",
             "error": error_msg,
             "message": "An unexpected error occurred during image analysis."
         }
+    finally:
+        # Clean up temp file if we created one
+        if temp_file_path and os.path.exists(temp_file_path):
+            os.unlink(temp_file_path)
+            log.info(f"{log_identifier} Cleaned up temporary file: {temp_file_path}")
 
 
 # Standalone testing
@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+_LOG_ID = "[local-tts:cache]"
+
+DEFAULT_CACHE_DIR = os.environ.get("LOCAL_TTS_CACHE") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache"), "local_tts"
+)
+DEFAULT_CACHE_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+MEMORY_CACHE_SIZE = 32
+# Minimum seconds between directory sweeps for expired and excess entries
+PRUNE_INTERVAL_SECONDS = 600
+
+
+def audio_cache_key(text: str, speaker_name: str, encoding: str) -> str:
+    """Content address of the MP3 for a text, voice, and encoder setting."""
+    return hashlib.sha256(f"{speaker_name}\0{encoding}\0{text}".encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Content-addressed store of generated MP3s, on disk with a small in-memory LRU in front.
+
+    Entries are written atomically and expire by file modification time, so a cache
+    directory can be shared between processes. Expired files are deleted when read,
+    and writes sweep the directory at most every ``PRUNE_INTERVAL_SECONDS``, removing
+    expired entries and then the oldest ones until the total fits in ``max_bytes``.
+    Methods are blocking and meant to run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        memory_size: int = MEMORY_CACHE_SIZE,
+    ):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self.max_bytes = max_bytes
+        self.memory_size = memory_size
+        # key -> (stored at epoch seconds, mp3 bytes), least recently used first
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_prune: Optional[float] = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".mp3")
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log.warning(f"{_LOG_ID} Failed to remove cache file {path}: {e}")
+
+    def _remember(self, key: str, ts: float, data: bytes) -> None:
+        with self._lock:
+            self._memory[key] = (ts, data)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str, ttl: float) -> Optional[bytes]:
+        """
+        Read a cached MP3.
+
+        Args:
+            key: Key from audio_cache_key
+            ttl: Maximum age in seconds of an entry that may be returned
+
+        Returns:
+            The MP3 bytes, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is not None and time.time() - entry[0] < ttl:
+            return entry[1]
+
+        path = self._path(key)
+        try:
+            ts = os.path.getmtime(path)
+            if time.time() - ts >= ttl:
+                self._forget(key)
+                self._remove(path)
+                return None
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self._forget(key)
+            return None
+        except OSError as e:
+            log.warning(f"{_LOG_ID} Ignoring unreadable cache entry {key}: {e}")
+            return None
+
+        self._remember(key, ts, data)
+        return data
+
+    def set(self, key: str, data: bytes, ttl: float = DEFAULT_CACHE_TTL_SECONDS) -> None:
+        """
+        Store an MP3, replacing any previous entry atomically.
+
+        Args:
+            key: Key from audio_cache_key
+            data: The MP3 bytes
+            ttl: Age in seconds after which entries are removed by the periodic sweep
+        """
+        self._remember(key, time.time(), data)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log.warning(f"{_LOG_ID} Failed to write cache entry {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+        now = time.monotonic()
+        with self._lock:
+            due = self._last_prune is None or now - self._last_prune >= PRUNE_INTERVAL_SECONDS
+            if due:
+                self._last_prune = now
+        if due:
+            self.prune(ttl)
+
+    def prune(self, ttl: float) -> None:
+        """
+        Delete expired entries, then the oldest ones until the cache fits in max_bytes.
+
+        Args:
+            ttl: Maximum age in seconds of an entry that is kept
+        """
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for dir_entry in it:
+                    try:
+                        stat = dir_entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, dir_entry.name))
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            log.warning(f"{_LOG_ID} Failed to list cache directory {self.cache_dir}: {e}")
+            return
+
+        now = time.time()
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, name in entries:
+            if now - mtime < ttl and total <= self.max_bytes:
+                break
+            self._forget(name[:-len(".mp3")] if name.endswith(".mp3") else name)
+            self._remove(os.path.join(self.cache_dir, name))
+            total -= size
+            removed += 1
+        if removed:
+            log.info(f"{_LOG_ID} Pruned {removed} cache entries from {self.cache_dir}")
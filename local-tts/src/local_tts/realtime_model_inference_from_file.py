@@ -132,74 +132,62 @@ def parse_args():
     
     return parser.parse_args()
 
-def main():
-    args = parse_args()
-
+def resolve_device(device: str) -> str:
+    """Normalize the requested device, falling back to CPU when MPS is unavailable."""
     # Normalize potential 'mpx' typo to 'mps'
-    if args.device.lower() == "mpx":
+    if device.lower() == "mpx":
         print("Note: device 'mpx' detected, treating it as 'mps'.")
-        args.device = "mps"
+        device = "mps"
 
     # Validate mps availability if requested
-    if args.device == "mps" and not torch.backends.mps.is_available():
+    if device == "mps" and not torch.backends.mps.is_available():
         print("Warning: MPS not available. Falling back to CPU.")
-        args.device = "cpu"
+        device = "cpu"
 
-    print(f"Using device: {args.device}")
+    return device
 
-    # Initialize voice mapper
-    voice_mapper = VoiceMapper()
-    
-    # Check if txt file exists
-    if not os.path.exists(args.txt_path):
-        print(f"Error: txt file not found: {args.txt_path}")
-        return
-    
-    # Read and parse txt file
-    print(f"Reading script from: {args.txt_path}")
-    with open(args.txt_path, 'r', encoding='utf-8') as f:
-        scripts = f.read().strip()
-    
-    if not scripts:
-        print("Error: No valid scripts found in the txt file")
-        return
 
-    full_script = scripts.replace("’", "'").replace('“', '"').replace('”', '"')
+def prepare_script(text: str) -> str:
+    """Replace typographic quotes the tokenizer does not expect."""
+    return text.replace("’", "'").replace('“', '"').replace('”', '"')
+
 
-    print(f"Loading processor & model from {args.model_path}")
-    processor = VibeVoiceStreamingProcessor.from_pretrained(args.model_path)
+def load_model(model_path: str, device: str):
+    """Load the processor and model for a device; returns (processor, model)."""
+    print(f"Loading processor & model from {model_path}")
+    processor = VibeVoiceStreamingProcessor.from_pretrained(model_path)
 
     # Decide dtype & attention implementation
-    if args.device == "mps":
+    if device == "mps":
         load_dtype = torch.float32  # MPS requires float32
         attn_impl_primary = "sdpa"  # flash_attention_2 not supported on MPS
-    elif args.device == "cuda":
+    elif device == "cuda":
         load_dtype = torch.bfloat16
         attn_impl_primary = "flash_attention_2"
     else:  # cpu
         load_dtype = torch.float32
         attn_impl_primary = "sdpa"
-    print(f"Using device: {args.device}, torch_dtype: {load_dtype}, attn_implementation: {attn_impl_primary}")
+    print(f"Using device: {device}, torch_dtype: {load_dtype}, attn_implementation: {attn_impl_primary}")
     # Load model with device-specific logic
     try:
-        if args.device == "mps":
+        if device == "mps":
             model = VibeVoiceStreamingForConditionalGenerationInference.from_pretrained(
-                args.model_path,
+                model_path,
                 torch_dtype=load_dtype,
                 attn_implementation=attn_impl_primary,
                 device_map=None,  # load then move
             )
             model.to("mps")
-        elif args.device == "cuda":
+        elif device == "cuda":
             model = VibeVoiceStreamingForConditionalGenerationInference.from_pretrained(
-                args.model_path,
+                model_path,
                 torch_dtype=load_dtype,
                 device_map="cuda",
                 attn_implementation=attn_impl_primary,
             )
         else:  # cpu
             model = VibeVoiceStreamingForConditionalGenerationInference.from_pretrained(
-                args.model_path,
+                model_path,
                 torch_dtype=load_dtype,
                 device_map="cpu",
                 attn_implementation=attn_impl_primary,
@@ -210,12 +198,12 @@ def main():
             print(traceback.format_exc())
             print("Error loading the model. Trying to use SDPA. However, note that only flash_attention_2 has been fully tested, and using SDPA may result in lower audio quality.")
             model = VibeVoiceStreamingForConditionalGenerationInference.from_pretrained(
-                args.model_path,
+                model_path,
                 torch_dtype=load_dtype,
-                device_map=(args.device if args.device in ("cuda", "cpu") else None),
+                device_map=(device if device in ("cuda", "cpu") else None),
                 attn_implementation='sdpa'
             )
-            if args.device == "mps":
+            if device == "mps":
                 model.to("mps")
         else:
             raise e
@@ -226,10 +214,13 @@ def main():
 
     if hasattr(model.model, 'language_model'):
        print(f"Language model attention: {model.model.language_model.config._attn_implementation}")
-    
-    target_device = args.device if args.device != "cpu" else "cpu"
-    voice_sample = voice_mapper.get_voice_path(args.speaker_name)
-    all_prefilled_outputs = torch.load(voice_sample, map_location=target_device, weights_only=False)
+
+    return processor, model
+
+
+def generate_speech(model, processor, full_script: str, all_prefilled_outputs, device: str, cfg_scale: float):
+    """Generate speech for a script with a voice's cached prompt; returns (inputs, outputs, generation_time)."""
+    target_device = device if device != "cpu" else "cpu"
 
     # Prepare inputs for the model
     inputs = processor.process_input_with_cached_prompt(
@@ -245,14 +236,14 @@ def main():
         if torch.is_tensor(v):
             inputs[k] = v.to(target_device)
 
-    print(f"Starting generation with cfg_scale: {args.cfg_scale}")
+    print(f"Starting generation with cfg_scale: {cfg_scale}")
 
     # Generate audio
     start_time = time.time()
     outputs = model.generate(
         **inputs,
         max_new_tokens=None,
-        cfg_scale=args.cfg_scale,
+        cfg_scale=cfg_scale,
         tokenizer=processor.tokenizer,
         generation_config={'do_sample': False},
         verbose=True,
@@ -260,6 +251,44 @@ def main():
     )
     generation_time = time.time() - start_time
     print(f"Generation time: {generation_time:.2f} seconds")
+    return inputs, outputs, generation_time
+
+
+def main():
+    args = parse_args()
+
+    args.device = resolve_device(args.device)
+
+    print(f"Using device: {args.device}")
+
+    # Initialize voice mapper
+    voice_mapper = VoiceMapper()
+    
+    # Check if txt file exists
+    if not os.path.exists(args.txt_path):
+        print(f"Error: txt file not found: {args.txt_path}")
+        return
+    
+    # Read and parse txt file
+    print(f"Reading script from: {args.txt_path}")
+    with open(args.txt_path, 'r', encoding='utf-8') as f:
+        scripts = f.read().strip()
+    
+    if not scripts:
+        print("Error: No valid scripts found in the txt file")
+        return
+
+    full_script = prepare_script(scripts)
+
+    processor, model = load_model(args.model_path, args.device)
+    
+    target_device = args.device if args.device != "cpu" else "cpu"
+    voice_sample = voice_mapper.get_voice_path(args.speaker_name)
+    all_prefilled_outputs = torch.load(voice_sample, map_location=target_device, weights_only=False)
+
+    inputs, outputs, generation_time = generate_speech(
+        model, processor, full_script, all_prefilled_outputs, args.device, args.cfg_scale
+    )
     
     # Calculate audio duration and additional metrics
     if outputs.speech_outputs and outputs.speech_outputs[0] is not None:
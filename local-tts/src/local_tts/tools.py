@@ -1,10 +1,15 @@
 import logging
 import asyncio
+import codecs
+import functools
+import json
 import os
+import re
+import shutil
 import tempfile
-import subprocess
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from google.adk.tools import ToolContext
 from solace_agent_mesh.agent.utils.artifact_helpers import (
@@ -13,10 +18,429 @@ from solace_agent_mesh.agent.utils.artifact_helpers import (
 )
 from solace_agent_mesh.agent.utils.context_helpers import get_original_session_id
 
+from .cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CACHE_TTL_SECONDS,
+    AudioCache,
+    audio_cache_key,
+)
+
 log = logging.getLogger(__name__)
 
 # Available voices
-AVAILABLE_VOICES = ["Carter", "Davis", "Emma", "Grace"]
+AVAILABLE_VOICES = frozenset(("Carter", "Davis", "Emma", "Grace"))
+
+MODEL_PATH = "microsoft/VibeVoice-Realtime-0.5B"
+TTS_TIMEOUT_SECONDS = 300
+MP3_TIMEOUT_SECONDS = 60
+DEFAULT_MP3_BITRATE = "64k"
+DEFAULT_MAX_CONCURRENT_JOBS = int(os.environ.get("LOCAL_TTS_CONCURRENCY", 2))
+
+PLUGIN_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+async def _run_command(cmd: List[str], timeout: float) -> Tuple[int, bytes, str]:
+    """
+    Run a command as a native asyncio subprocess, so the event loop keeps serving
+    other requests while it runs.
+
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds to wait before killing the process
+
+    Returns:
+        Tuple of (return code, stdout, decoded stderr)
+
+    Raises:
+        asyncio.TimeoutError: If the command did not finish in time
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stdout, stderr.decode("utf-8", errors="replace")
+
+
+# Synthesis is CPU/GPU bound and every warm worker holds its own copy of the model, so
+# requests beyond the limit wait for a free slot instead of all competing at once.
+_JOB_SEMAPHORES: Dict[int, asyncio.Semaphore] = {}
+
+
+def _job_limit(tool_config: Dict[str, Any]) -> int:
+    return max(1, int(tool_config.get("max_concurrent_jobs", DEFAULT_MAX_CONCURRENT_JOBS)))
+
+
+def _job_slot(tool_config: Dict[str, Any]) -> asyncio.Semaphore:
+    """Semaphore bounding concurrent synthesis jobs, shared by calls with the same limit."""
+    limit = _job_limit(tool_config)
+    semaphore = _JOB_SEMAPHORES.get(limit)
+    if semaphore is None:
+        semaphore = _JOB_SEMAPHORES[limit] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+# Encoder names reported by `ffmpeg -encoders`, probed once on first conversion
+_FFMPEG_ENCODERS: Optional[frozenset] = None
+
+
+async def _ffmpeg_encoders() -> frozenset:
+    """Return the audio/video encoders this ffmpeg build was compiled with."""
+    global _FFMPEG_ENCODERS
+    if _FFMPEG_ENCODERS is None:
+        try:
+            returncode, stdout, _ = await _run_command(
+                ["ffmpeg", "-hide_banner", "-encoders"], timeout=MP3_TIMEOUT_SECONDS
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            log.warning(f"[local-tts:ffmpeg] Could not list ffmpeg encoders: {e}")
+            returncode, stdout = 1, b""
+        encoders = set()
+        if returncode == 0:
+            # Lines look like " A....D libshine             libshine MP3 (MPEG audio layer 3)"
+            for line in stdout.decode("utf-8", errors="replace").splitlines():
+                fields = line.split()
+                if len(fields) > 1:
+                    encoders.add(fields[1])
+        _FFMPEG_ENCODERS = frozenset(encoders)
+    return _FFMPEG_ENCODERS
+
+
+def _mp3_bitrate_kbps(tool_config: Dict[str, Any]) -> int:
+    """Return the configured MP3 bitrate ("64k" or 64) in kbit/s."""
+    return int(str(tool_config.get("mp3_bitrate", DEFAULT_MP3_BITRATE)).lower().rstrip("k"))
+
+
+async def _mp3_codec_args(tool_config: Dict[str, Any]) -> List[str]:
+    """
+    Choose the ffmpeg MP3 encoder arguments.
+
+    libshine is a fixed-point encoder that skips LAME's psychoacoustic search, which
+    is several times faster and sounds fine for speech. LAME is used when it is
+    requested with `mp3_encoder: libmp3lame` or when ffmpeg was built without shine.
+    """
+    encoder = tool_config.get("mp3_encoder", "lameenc")
+    if encoder in ("lameenc", "libshine") and "libshine" in await _ffmpeg_encoders():
+        return ["-codec:a", "libshine", "-b:a", f"{_mp3_bitrate_kbps(tool_config)}k"]
+    if encoder in ("lameenc", "libshine"):
+        log.info("[local-tts:ffmpeg] libshine is not available in ffmpeg, using libmp3lame")
+    return ["-codec:a", "libmp3lame", "-qscale:a", str(tool_config.get("mp3_quality", 5))]
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _write_text_file(path: str, text: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_audio_cache(cache_dir: str, max_bytes: int) -> AudioCache:
+    """Get the shared MP3 cache for a directory."""
+    return AudioCache(cache_dir, max_bytes=max_bytes)
+
+
+# Longest stderr line kept for error messages
+_STDERR_LINE_LIMIT = 4096
+
+
+class _TTSWorker:
+    """
+    A warm tts_worker.py process that keeps VibeVoice loaded between requests.
+
+    The process is started on first use and handles one request at a time over
+    line-delimited JSON. It is restarted on the next request after it exits, times
+    out, or a caller gives up waiting, so a stale response is never read as a new one.
+    """
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._stderr_tail: deque = deque(maxlen=5)
+        self._lock = asyncio.Lock()
+
+    async def _start(self) -> None:
+        log.info(f"[local-tts:worker] Starting TTS worker for {self.model_path}")
+        self._stderr_tail.clear()
+        self._proc = await asyncio.create_subprocess_exec(
+            "python", "-u", os.path.join(PLUGIN_DIR, "tts_worker.py"),
+            "--model_path", self.model_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._stderr_task = asyncio.create_task(self._drain_stderr(self._proc))
+
+    async def _drain_stderr(self, proc: asyncio.subprocess.Process) -> None:
+        # Model loading and generation are chatty; keep the last lines for error messages.
+        # Progress bars redraw with \r and no newline, so read raw chunks rather than lines:
+        # a line past StreamReader's limit would end this task, and the worker would then
+        # block on a full stderr pipe.
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        while True:
+            chunk = await proc.stderr.read(65536)
+            pending += decoder.decode(chunk, final=not chunk)
+            *lines, pending = re.split(r"[\r\n]", pending)
+            if not chunk:
+                lines.append(pending)
+            for text in lines:
+                if text.strip():
+                    self._stderr_tail.append(text.rstrip())
+                    log.debug(f"[local-tts:worker] {text.rstrip()}")
+            if not chunk:
+                break
+            # Only a line's end is worth keeping if it never terminates
+            pending = pending[-_STDERR_LINE_LIMIT:]
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def _kill(self) -> None:
+        if self._proc is not None and self._proc.returncode is None:
+            self._proc.kill()
+        self._proc = None
+
+    async def synthesize(
+        self,
+        text: str,
+        speaker_name: str,
+        output_path: str,
+        timeout: float,
+        mp3_path: Optional[str] = None,
+        mp3_bitrate_kbps: int = 64,
+    ) -> str:
+        """
+        Generate speech into a WAV file, or straight into an MP3 file if the worker can.
+
+        Args:
+            text: The text to convert to speech
+            speaker_name: The voice to use
+            output_path: Where the worker writes the WAV file
+            timeout: Seconds to wait for the worker, including model loading on first use
+            mp3_path: Where the worker writes the MP3 file if it has lameenc installed
+            mp3_bitrate_kbps: Bitrate for the worker's MP3 encoding
+
+        Returns:
+            The format the worker wrote, "mp3" to mp3_path or "wav" to output_path
+
+        Raises:
+            RuntimeError: If the worker reports an error or exits
+            asyncio.TimeoutError: If the worker did not respond in time
+        """
+        async with self._lock:
+            if self._proc is None or self._proc.returncode is not None:
+                await self._start()
+
+            request = {"text": text, "speaker_name": speaker_name, "output_path": output_path}
+            if mp3_path:
+                request["mp3_path"] = mp3_path
+                request["mp3_bitrate_kbps"] = mp3_bitrate_kbps
+            try:
+                self._proc.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+                await self._proc.stdin.drain()
+                line = await asyncio.wait_for(self._proc.stdout.readline(), timeout=timeout)
+            except (BrokenPipeError, ConnectionResetError):
+                line = b""
+            except BaseException:
+                # Timed out or cancelled: the worker may still answer, so it cannot be reused
+                self._kill()
+                raise
+
+            if not line:
+                await self._proc.wait()
+                await asyncio.wait([self._stderr_task], timeout=1)
+                self._proc = None
+                raise RuntimeError(f"TTS worker exited: {' '.join(self._stderr_tail)}")
+
+            response = json.loads(line)
+            if response.get("status") != "success":
+                raise RuntimeError(response.get("error", "unknown worker error"))
+            return response.get("format", "wav")
+
+
+# model path -> warm workers, started on demand up to the job limit
+_WORKERS: Dict[str, List[_TTSWorker]] = {}
+
+
+def _get_worker(model_path: str, max_workers: int) -> _TTSWorker:
+    """Pick an idle warm worker, adding one while fewer than max_workers exist."""
+    workers = _WORKERS.setdefault(model_path, [])
+    for worker in workers:
+        if not worker.busy:
+            return worker
+    if len(workers) < max_workers:
+        worker = _TTSWorker(model_path)
+        workers.append(worker)
+        return worker
+    # Only reachable when calls use different limits; queue on the first worker's lock
+    return workers[0]
+
+
+class _TTSError(RuntimeError):
+    """A synthesis step failed; the message is returned to the caller as-is."""
+
+
+async def _synthesize_mp3(
+    text: str, speaker_name: str, tool_config: Dict[str, Any], log_identifier: str
+) -> bytes:
+    """
+    Generate speech for the text and encode it as MP3.
+
+    Args:
+        text: The text to convert to speech
+        speaker_name: A validated voice name
+        tool_config: The tool configuration
+        log_identifier: Prefix for log messages
+
+    Returns:
+        The MP3 bytes
+
+    Raises:
+        _TTSError: If speech generation or MP3 conversion failed
+        asyncio.TimeoutError: If a step did not finish in time
+    """
+    # Create temporary directory for processing; everything written into it is removed at once
+    temp_dir = tempfile.mkdtemp(prefix="tts_")
+
+    try:
+        # Prepare output path
+        temp_wav_file = os.path.join(temp_dir, "input_generated.wav")
+        temp_mp3_file = None
+        audio_format = "wav"
+
+        if tool_config.get("warm_worker", True):
+            # Reuse a worker that keeps the model loaded instead of reloading it per call.
+            # With lameenc it also encodes the MP3 itself, so no ffmpeg process is needed.
+            if tool_config.get("mp3_encoder", "lameenc") == "lameenc":
+                temp_mp3_file = os.path.join(temp_dir, "output.mp3")
+            log.info(f"{log_identifier} Generating speech in the TTS worker")
+            try:
+                audio_format = await _get_worker(MODEL_PATH, _job_limit(tool_config)).synthesize(
+                    text,
+                    speaker_name,
+                    temp_wav_file,
+                    timeout=TTS_TIMEOUT_SECONDS,
+                    mp3_path=temp_mp3_file,
+                    mp3_bitrate_kbps=_mp3_bitrate_kbps(tool_config),
+                )
+            except RuntimeError as e:
+                log.error(f"{log_identifier} TTS generation failed: {e}")
+                raise _TTSError(f"TTS generation failed: {e}") from e
+        else:
+            # Write text to temporary file
+            temp_text_file = os.path.join(temp_dir, "input.txt")
+            await asyncio.to_thread(_write_text_file, temp_text_file, text)
+
+            log.info(f"{log_identifier} Created temporary text file: {temp_text_file}")
+
+            inference_script = os.path.join(PLUGIN_DIR, "realtime_model_inference_from_file.py")
+
+            # Build command to run TTS
+            # The script outputs to <output_dir>/<txt_filename>_generated.wav
+            cmd = [
+                "python",
+                inference_script,
+                "--model_path", MODEL_PATH,
+                "--txt_path", temp_text_file,
+                "--output_dir", temp_dir,
+                "--speaker_name", speaker_name,
+            ]
+
+            log.info(f"{log_identifier} Running TTS command: {' '.join(cmd)}")
+
+            # Run TTS generation
+            returncode, _, stderr = await _run_command(cmd, timeout=TTS_TIMEOUT_SECONDS)
+
+            if returncode != 0:
+                log.error(f"{log_identifier} TTS generation failed: {stderr}")
+                raise _TTSError(f"TTS generation failed: {stderr}")
+
+        log.info(f"{log_identifier} TTS generation completed successfully")
+
+        # File reads run in a thread so the event loop keeps serving other requests
+        if audio_format == "mp3":
+            return await asyncio.to_thread(_read_file, temp_mp3_file)
+
+        # Check if WAV file was created
+        if not os.path.exists(temp_wav_file):
+            log.error(f"{log_identifier} WAV file not found at {temp_wav_file}")
+            raise _TTSError("Generated WAV file not found")
+
+        # Convert WAV to MP3 using ffmpeg. ffmpeg reads the WAV from disk itself, so the
+        # uncompressed audio is never held in this process; the MP3 comes back on stdout.
+        ffmpeg_cmd = [
+            "ffmpeg",
+            "-loglevel", "error",
+            "-i", temp_wav_file,
+            *await _mp3_codec_args(tool_config),
+            "-f", "mp3",
+            "pipe:1"
+        ]
+
+        log.info(f"{log_identifier} Converting WAV to MP3")
+
+        returncode, mp3_content, stderr = await _run_command(ffmpeg_cmd, timeout=MP3_TIMEOUT_SECONDS)
+
+        if returncode != 0:
+            log.error(f"{log_identifier} MP3 conversion failed: {stderr}")
+            raise _TTSError(f"MP3 conversion failed: {stderr}")
+
+        log.info(f"{log_identifier} MP3 conversion completed successfully")
+        return mp3_content
+
+    finally:
+        # Cleanup temporary files
+        await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
+        log.info(f"{log_identifier} Cleaned up temporary files")
+
+
+# cache key -> task generating that audio, so identical concurrent requests share one run
+_IN_FLIGHT: Dict[str, asyncio.Task] = {}
+
+
+def _forget_in_flight(cache_key: str, task: asyncio.Task) -> None:
+    if _IN_FLIGHT.get(cache_key) is task:
+        del _IN_FLIGHT[cache_key]
+    if not task.cancelled():
+        # Mark the error as retrieved even if every caller gave up waiting
+        task.exception()
+
+
+async def _synthesize_and_cache(
+    text: str,
+    speaker_name: str,
+    tool_config: Dict[str, Any],
+    audio_cache: Optional[AudioCache],
+    cache_key: str,
+    log_identifier: str,
+) -> bytes:
+    job_slot = _job_slot(tool_config)
+    if job_slot.locked():
+        log.info(f"{log_identifier} All TTS slots are busy, waiting for one to free up")
+    async with job_slot:
+        mp3_content = await _synthesize_mp3(text, speaker_name, tool_config, log_identifier)
+    if audio_cache is not None:
+        await asyncio.to_thread(
+            audio_cache.set,
+            cache_key,
+            mp3_content,
+            tool_config.get("cache_ttl_seconds", DEFAULT_CACHE_TTL_SECONDS),
+        )
+    return mp3_content
 
 
 async def text_to_speech(
@@ -40,6 +464,7 @@ async def text_to_speech(
     plugin_name = "local-tts"
     log_identifier = f"[{plugin_name}:text_to_speech]"
     log.info(f"{log_identifier} Converting text to speech with speaker: {speaker_name}")
+    text_length = len(text)
 
     # Validate speaker
     if speaker_name not in AVAILABLE_VOICES:
@@ -55,12 +480,12 @@ async def text_to_speech(
         }
 
     inv_context = tool_context._invocation_context
-    app_name = getattr(inv_context, "app_name", None)
-    user_id = getattr(inv_context, "user_id", None)
+    app_name = inv_context.app_name
+    user_id = inv_context.user_id
     session_id = get_original_session_id(inv_context)
-    artifact_service = getattr(inv_context, "artifact_service", None)
+    artifact_service = inv_context.artifact_service
 
-    if not all([app_name, user_id, session_id, artifact_service]):
+    if not (app_name and user_id and session_id and artifact_service):
         missing_parts = [
             part
             for part, val in [
@@ -77,97 +502,53 @@ async def text_to_speech(
             "message": f"Missing required context parts: {', '.join(missing_parts)}",
         }
 
-    # Create temporary directory for processing
-    temp_dir = tempfile.mkdtemp(prefix="tts_")
-    temp_text_file = None
-    temp_wav_file = None
-    temp_mp3_file = None
-
-    try:
-        # Write text to temporary file
-        temp_text_file = os.path.join(temp_dir, "input.txt")
-        with open(temp_text_file, 'w', encoding='utf-8') as f:
-            f.write(text)
-
-        log.info(f"{log_identifier} Created temporary text file: {temp_text_file}")
-
-        # Determine paths
-        plugin_dir = os.path.dirname(os.path.abspath(__file__))
-        inference_script = os.path.join(plugin_dir, "realtime_model_inference_from_file.py")
-
-        # Prepare output path
-        temp_wav_file = os.path.join(temp_dir, "input_generated.wav")
-
-        # Build command to run TTS
-        # The script outputs to <output_dir>/<txt_filename>_generated.wav
-        cmd = [
-            "python",
-            inference_script,
-            "--model_path", "microsoft/VibeVoice-Realtime-0.5B",
-            "--txt_path", temp_text_file,
-            "--output_dir", temp_dir,
-            "--speaker_name", speaker_name,
-        ]
-
-        log.info(f"{log_identifier} Running TTS command: {' '.join(cmd)}")
-
-        # Run TTS generation
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
+    current_tool_config = tool_config if tool_config is not None else {}
+
+    # Identical text and voice produce identical audio, so serve repeats from the cache
+    # and let concurrent identical requests share one generation
+    encoding = ":".join(
+        str(part)
+        for part in (
+            MODEL_PATH,
+            current_tool_config.get("warm_worker", True),
+            current_tool_config.get("mp3_encoder", "lameenc"),
+            _mp3_bitrate_kbps(current_tool_config),
+            current_tool_config.get("mp3_quality", 5),
         )
-
-        if result.returncode != 0:
-            log.error(f"{log_identifier} TTS generation failed: {result.stderr}")
-            return {
-                "status": "error",
-                "message": f"TTS generation failed: {result.stderr}",
-            }
-
-        log.info(f"{log_identifier} TTS generation completed successfully")
-
-        # Check if WAV file was created
-        if not os.path.exists(temp_wav_file):
-            log.error(f"{log_identifier} WAV file not found at {temp_wav_file}")
-            return {
-                "status": "error",
-                "message": "Generated WAV file not found",
-            }
-
-        # Convert WAV to MP3 using ffmpeg
-        temp_mp3_file = os.path.join(temp_dir, "output.mp3")
-        ffmpeg_cmd = [
-            "ffmpeg",
-            "-i", temp_wav_file,
-            "-codec:a", "libmp3lame",
-            "-qscale:a", "2",
-            "-y",  # Overwrite output file
-            temp_mp3_file
-        ]
-
-        log.info(f"{log_identifier} Converting WAV to MP3")
-
-        result = subprocess.run(
-            ffmpeg_cmd,
-            capture_output=True,
-            text=True,
-            timeout=60
+    )
+    cache_key = audio_cache_key(text, speaker_name, encoding)
+    audio_cache = None
+    if current_tool_config.get("cache_enabled", True):
+        audio_cache = _get_audio_cache(
+            current_tool_config.get("cache_dir") or DEFAULT_CACHE_DIR,
+            int(current_tool_config.get("cache_max_mb", DEFAULT_CACHE_MAX_BYTES // (1024 * 1024))) * 1024 * 1024,
         )
 
-        if result.returncode != 0:
-            log.error(f"{log_identifier} MP3 conversion failed: {result.stderr}")
-            return {
-                "status": "error",
-                "message": f"MP3 conversion failed: {result.stderr}",
-            }
-
-        log.info(f"{log_identifier} MP3 conversion completed successfully")
-
-        # Read MP3 file
-        with open(temp_mp3_file, 'rb') as f:
-            mp3_content = f.read()
+    try:
+        mp3_content = None
+        if audio_cache is not None:
+            mp3_content = await asyncio.to_thread(
+                audio_cache.get,
+                cache_key,
+                current_tool_config.get("cache_ttl_seconds", DEFAULT_CACHE_TTL_SECONDS),
+            )
+
+        if mp3_content is not None:
+            log.info(f"{log_identifier} Serving cached audio for this text and speaker")
+        else:
+            task = _IN_FLIGHT.get(cache_key)
+            if task is None:
+                task = asyncio.create_task(
+                    _synthesize_and_cache(
+                        text, speaker_name, current_tool_config, audio_cache, cache_key, log_identifier
+                    )
+                )
+                _IN_FLIGHT[cache_key] = task
+                task.add_done_callback(functools.partial(_forget_in_flight, cache_key))
+            else:
+                log.info(f"{log_identifier} Joining an identical request already being synthesized")
+            # Shielded so one caller giving up does not cancel the others' audio
+            mp3_content = await asyncio.shield(task)
 
         # Generate filename
         timestamp = datetime.now(timezone.utc)
@@ -178,9 +559,9 @@ async def text_to_speech(
             "description": f"Text-to-speech audio generated by {plugin_name}",
             "source_tool": "text_to_speech",
             "speaker": speaker_name,
-            "text_preview": text[:100] if len(text) > 100 else text,
+            "text_preview": text[:100],
             "creation_timestamp_iso": timestamp.isoformat(),
-            "text_length": len(text),
+            "text_length": text_length,
         }
 
         log.info(f"{log_identifier} Saving MP3 artifact: {output_filename}")
@@ -214,10 +595,15 @@ async def text_to_speech(
             "output_filename": output_filename,
             "output_version": save_result["data_version"],
             "speaker": speaker_name,
-            "text_length": len(text),
+            "text_length": text_length,
         }
 
-    except subprocess.TimeoutExpired:
+    except _TTSError as e:
+        return {
+            "status": "error",
+            "message": str(e),
+        }
+    except asyncio.TimeoutError:
         log.error(f"{log_identifier} TTS generation timed out")
         return {
             "status": "error",
@@ -229,17 +615,3 @@ async def text_to_speech(
             "status": "error",
             "message": f"Unexpected error during TTS generation: {str(e)}",
         }
-    finally:
-        # Cleanup temporary files
-        try:
-            if temp_text_file and os.path.exists(temp_text_file):
-                os.remove(temp_text_file)
-            if temp_wav_file and os.path.exists(temp_wav_file):
-                os.remove(temp_wav_file)
-            if temp_mp3_file and os.path.exists(temp_mp3_file):
-                os.remove(temp_mp3_file)
-            if os.path.exists(temp_dir):
-                os.rmdir(temp_dir)
-            log.info(f"{log_identifier} Cleaned up temporary files")
-        except Exception as e:
-            log.warning(f"{log_identifier} Error cleaning up temporary files: {e}")
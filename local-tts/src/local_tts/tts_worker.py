@@ -0,0 +1,130 @@
+"""
+Long-lived VibeVoice worker for the local-tts plugin.
+
+Loads the model once, then reads one JSON request per line on stdin:
+
+    {"text": "...", "speaker_name": "Carter", "output_path": "/tmp/tts_x/output.wav"}
+
+and answers each with one JSON line on stdout, either {"status": "success", "format": "wav"}
+or {"status": "error", "error": "..."}. Everything the model code prints goes to stderr,
+so stdout carries only responses.
+
+A request may also carry "mp3_path" and "mp3_bitrate_kbps". If lameenc is installed the
+audio is then encoded in-process and written to mp3_path instead, and the response has
+"format": "mp3"; otherwise the WAV is written as usual.
+"""
+import argparse
+import json
+import sys
+import traceback
+
+import numpy as np
+import torch
+
+try:
+    import lameenc
+except ImportError:
+    lameenc = None
+
+from realtime_model_inference_from_file import (
+    VoiceMapper,
+    generate_speech,
+    load_model,
+    prepare_script,
+    resolve_device,
+)
+
+
+# VibeVoice generates 24kHz mono audio
+SAMPLE_RATE = 24000
+
+
+def encode_mp3(speech, bitrate_kbps):
+    """Encode a float waveform tensor in [-1, 1] to MP3 bytes with LAME."""
+    audio = speech.detach().float().cpu().numpy().reshape(-1)
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+    encoder = lameenc.Encoder()
+    encoder.set_bit_rate(bitrate_kbps)
+    encoder.set_in_sample_rate(SAMPLE_RATE)
+    encoder.set_channels(1)
+    encoder.set_quality(7)
+    return encoder.encode(pcm.tobytes()) + encoder.flush()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="VibeVoice TTS worker")
+    parser.add_argument(
+        "--model_path",
+        type=str,
+        default="microsoft/VibeVoice-Realtime-0.5B",
+        help="Path to the HuggingFace model directory",
+    )
+    parser.add_argument(
+        "--device",
+        type=str,
+        default=("cuda" if torch.cuda.is_available() else ("mps" if torch.backends.mps.is_available() else "cpu")),
+        help="Device for inference: cuda | mps | cpu",
+    )
+    parser.add_argument(
+        "--cfg_scale",
+        type=float,
+        default=1.5,
+        help="CFG (Classifier-Free Guidance) scale for generation (default: 1.5)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Keep stdout for responses; progress output from the model code goes to stderr
+    responses = sys.stdout
+    sys.stdout = sys.stderr
+
+    device = resolve_device(args.device)
+    voice_mapper = VoiceMapper()
+    processor, model = load_model(args.model_path, device)
+
+    # speaker name -> cached voice prompt; generate_speech copies it before use
+    voice_prompts = {}
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            script = request["text"].strip()
+            if not script:
+                raise ValueError("No text to synthesize")
+            speaker_name = request["speaker_name"]
+            if speaker_name not in voice_prompts:
+                voice_prompts[speaker_name] = torch.load(
+                    voice_mapper.get_voice_path(speaker_name), map_location=device, weights_only=False
+                )
+
+            _, outputs, _ = generate_speech(
+                model, processor, prepare_script(script),
+                voice_prompts[speaker_name], device, args.cfg_scale,
+            )
+            if not outputs.speech_outputs or outputs.speech_outputs[0] is None:
+                raise RuntimeError("No audio output generated")
+
+            if request.get("mp3_path") and lameenc is not None:
+                mp3 = encode_mp3(outputs.speech_outputs[0], request.get("mp3_bitrate_kbps", 64))
+                with open(request["mp3_path"], "wb") as f:
+                    f.write(mp3)
+                response = {"status": "success", "format": "mp3"}
+            else:
+                processor.save_audio(outputs.speech_outputs[0], output_path=request["output_path"])
+                response = {"status": "success", "format": "wav"}
+        except Exception as e:
+            traceback.print_exc()
+            response = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
+
+
+if __name__ == "__main__":
+    main()